@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Startup Analyst Platform - LLM Response Cache
+Exact-match cache for model responses so re-analysing the same startup
+does not hit Gemini again. Off unless LLM_CACHE_ENABLED=true; demo scripts
+turn it on with enable_for_demo()
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+class LLMCache:
+    """In-memory LRU cache backed by one JSON file per entry on disk
+    
+    Entries expire ttl_seconds after they were stored, so answers are
+    refreshed at least that often.
+    """
+    
+    def __init__(self, cache_dir: str = None, max_memory_items: int = 256, enabled: bool = True,
+                 ttl_seconds: float = 24 * 60 * 60):
+        self.cache_dir = Path(cache_dir or os.getenv("LLM_CACHE_DIR", ".llm_cache"))
+        self.max_memory_items = max_memory_items
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def cache_key(model_name: str, agent_name: str, prompt: str) -> str:
+        """Build a deterministic key for a model/agent/prompt combination"""
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "agent": agent_name},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss"""
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            if key in self._memory:
+                text, stored_at = self._memory[key]
+                if not self._expired(stored_at):
+                    self._memory.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return text
+                del self._memory[key]
+        
+        try:
+            with open(self.cache_dir / f"{key}.json", "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            text, stored_at = entry["text"], entry["stored_at"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, unreadable, or written before entries carried a timestamp
+            text, stored_at = None, None
+        
+        if text is None or self._expired(stored_at):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        
+        with self._lock:
+            self.stats["hits"] += 1
+            self._remember(key, text, stored_at)
+        return text
+    
+    def set(self, key: str, text: str):
+        """Store response text in memory and on disk"""
+        if not self.enabled:
+            return
+        
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, text, stored_at)
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # A unique temp file per write, so processes storing the same key
+            # never interleave into one file before the rename
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"text": text, "stored_at": stored_at}, f)
+                os.replace(tmp_path, self.cache_dir / f"{key}.json")
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # A read-only filesystem only costs us persistence, not correctness
+            pass
+    
+    def _expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl_seconds
+    
+    def _remember(self, key: str, text: str, stored_at: float):
+        self._memory[key] = (text, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+# Shared cache used by all analyst agents; off by default so the backends
+# always ask the model unless a deployment opts in
+llm_cache = LLMCache(
+    enabled=os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true",
+    ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+)
+
+def enable_for_demo():
+    """Turn the cache on for a demo script unless LLM_CACHE_ENABLED is set explicitly"""
+    if "LLM_CACHE_ENABLED" not in os.environ:
+        llm_cache.enabled = True
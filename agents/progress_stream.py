@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Startup Analyst Platform - Analysis Progress Streams
+Keeps the latest progress event of each analysis, so Server-Sent Event
+streams that connect late or reconnect still catch up with it
+"""
+
+import re
+import time
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
+
+import orjson
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+# A finished analysis is kept this long for late subscribers and reconnects
+FINISHED_TTL_SECONDS = 60
+# An analysis with no new event for this long is dropped, e.g. a stream opened
+# for an id that never gets analysed
+IDLE_TTL_SECONDS = 600
+
+# Anyone who knows an id can follow its stream, so client-chosen ids must be
+# at least as hard to guess as secrets.token_urlsafe(12) (a UUID4 qualifies)
+VALID_ID = re.compile(r"[A-Za-z0-9_-]{16,64}")
+
+class AnalysisProgress:
+    """Latest progress event of one analysis, pre-encoded, plus a wake-up for waiting streams"""
+
+    def __init__(self):
+        self.payload: Optional[bytes] = None
+        self.version = 0
+        self.finished = False
+        self.claimed = False
+        self.updated_at = time.monotonic()
+        self._changed = asyncio.Event()
+
+    def publish(self, event: Dict[str, Any]):
+        self.payload = orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str)
+        self.version += 1
+        self.finished = event.get("status") in TERMINAL_STATUSES
+        self.updated_at = time.monotonic()
+        # Wake every waiting stream, then arm a fresh event for the next update
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for the next publish; False if the timeout passed first"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+class ProgressRegistry:
+    """Progress per startup_id, created by whichever of the analysis or a stream arrives first"""
+
+    def __init__(self, finished_ttl: float = FINISHED_TTL_SECONDS, idle_ttl: float = IDLE_TTL_SECONDS):
+        self.finished_ttl = finished_ttl
+        self.idle_ttl = idle_ttl
+        self._analyses: Dict[str, AnalysisProgress] = {}
+
+    def get(self, startup_id: str) -> AnalysisProgress:
+        self._expire()
+        progress = self._analyses.get(startup_id)
+        if progress is None:
+            progress = self._analyses[startup_id] = AnalysisProgress()
+        return progress
+
+    @staticmethod
+    def valid_id(startup_id: str) -> bool:
+        return VALID_ID.fullmatch(startup_id) is not None
+
+    def claim(self, startup_id: str) -> bool:
+        """Reserve an id for one analysis; False if another analysis already has it"""
+        progress = self.get(startup_id)
+        if progress.claimed:
+            return False
+        progress.claimed = True
+        return True
+
+    def publish(self, startup_id: str, event: Dict[str, Any]):
+        """Record an analysis's latest event and push it to its streams"""
+        self.get(startup_id).publish(event)
+
+    async def stream(self, startup_id: str, heartbeat_seconds: float, timeout_seconds: float) -> AsyncIterator[bytes]:
+        """Server-Sent Events for one analysis: its latest event straight away, then
+        each update, until the final event or the timeout"""
+        progress = self.get(startup_id)
+        deadline = time.monotonic() + timeout_seconds
+        seen = 0
+        while time.monotonic() < deadline:
+            if progress.version != seen:
+                # Events are full snapshots, so only the newest needs sending
+                seen = progress.version
+                yield b"data: " + progress.payload + b"\n\n"
+                if progress.finished:
+                    return
+            elif not await progress.wait(heartbeat_seconds):
+                # SSE comment line keeps proxies from closing an idle stream
+                yield b": keep-alive\n\n"
+
+    def _expire(self):
+        now = time.monotonic()
+        expired = [
+            startup_id for startup_id, progress in self._analyses.items()
+            if now - progress.updated_at > (self.finished_ttl if progress.finished else self.idle_ttl)
+        ]
+        for startup_id in expired:
+            del self._analyses[startup_id]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Startup Analyst Platform - Gemini Rate Limiter
+Bounds concurrent model calls and paces them under the per-minute quota so
+large batch runs do not turn into 429 retry storms
+"""
+
+import os
+import time
+import random
+import asyncio
+from typing import Any, AsyncIterator
+
+from google.api_core.exceptions import ResourceExhausted
+
+class TokenBucket:
+    """Token bucket refilled at a fixed rate per second"""
+    
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class RateLimitedModel:
+    """Wraps a GenerativeModel so async calls share a concurrency cap, a QPM budget and backoff"""
+    
+    def __init__(self, model: Any, qpm: int = 500, max_concurrency: int = 64,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 32.0):
+        self._model = model
+        self.qpm = qpm
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._loop = None
+        self._semaphore = None
+        self._bucket = None
+    
+    def __getattr__(self, name: str) -> Any:
+        # Everything except the async call goes straight to the wrapped model
+        return getattr(self._model, name)
+    
+    def _bind_loop(self):
+        # asyncio primitives belong to one event loop, and the blocking wrappers
+        # start a fresh loop per run, so rebuild them when the loop changes
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            # Let a full set of concurrent calls start at once, then pace at the QPM rate
+            self._bucket = TokenBucket(self.qpm / 60, capacity=self.max_concurrency)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.5)
+    
+    async def generate_content_async(self, *args, **kwargs) -> Any:
+        """Rate-limited generate_content_async, retrying when the quota is exhausted"""
+        self._bind_loop()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._bucket.acquire()
+                try:
+                    return await self._model.generate_content_async(*args, **kwargs)
+                except ResourceExhausted:
+                    if attempt >= self.max_retries:
+                        raise
+            # Back off outside the semaphore so other calls are not held up
+            await asyncio.sleep(self._backoff_delay(attempt))
+            attempt += 1
+    
+    async def stream_content_async(self, *args, **kwargs) -> AsyncIterator[Any]:
+        """Rate-limited streaming generate_content_async, yielding the response chunks
+        
+        The concurrency slot is held until the stream is consumed or closed, since
+        that is when the call actually uses the connection and the quota. A quota
+        error before the first chunk is retried; after it the partial answer is lost,
+        so the error propagates.
+        """
+        self._bind_loop()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._bucket.acquire()
+                started = False
+                try:
+                    response = await self._model.generate_content_async(*args, stream=True, **kwargs)
+                    try:
+                        async for chunk in response:
+                            started = True
+                            yield chunk
+                    finally:
+                        # Also runs when the caller stops early and closes this generator
+                        await _close_stream(response)
+                    return
+                except ResourceExhausted:
+                    if started or attempt >= self.max_retries:
+                        raise
+            # Back off outside the semaphore so other calls are not held up
+            await asyncio.sleep(self._backoff_delay(attempt))
+            attempt += 1
+
+async def _close_stream(response: Any):
+    """End a streaming response's gRPC call now instead of when it is garbage collected"""
+    # Vertex AI streams are async generators; the Google AI SDK wraps the gRPC call
+    aclose = getattr(response, "aclose", None)
+    if aclose is not None:
+        await aclose()
+        return
+    cancel = getattr(getattr(response, "_iterator", None), "cancel", None)
+    if cancel is not None:
+        cancel()
+
+def rate_limited(model: Any) -> RateLimitedModel:
+    """Wrap a model with the limits configured in the environment"""
+    return RateLimitedModel(
+        model,
+        qpm=int(os.getenv("GEMINI_QPM", "500")),
+        max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "64"))
+    )
@@ -5,16 +5,218 @@ Multi-agent system for startup analysis using Google's agentic framework
 """
 
 import os
+import re
 import json
+import time
 import asyncio
-from typing import Dict, List, Optional, Any
+import functools
+from array import array
+from typing import Callable, Dict, List, Optional, Any, Sequence
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Google AI imports
 import vertexai
 from vertexai.generative_models import GenerativeModel, Part
 import google.generativeai as genai
+from google.auth.exceptions import GoogleAuthError
+
+# orjson is optional; fall back to the stdlib encoder when it is missing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from agents.llm_cache import llm_cache
+from agents.rate_limiter import rate_limited
+
+# Response parsing patterns, compiled once at import
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+_SCORE_RE = re.compile(r'(\w+.*?):\s*(\d+)/10', re.IGNORECASE)
+_REC_RE = re.compile(r'(?:recommend|suggest|advise).*?([^.!?]*[.!?])', re.IGNORECASE)
+_RISK_RE = re.compile(r'(\w+.*?)\s*risk[s]?:\s*(low|medium|high)', re.IGNORECASE)
+_MIT_RE = re.compile(r'(?:mitigate|reduce|address).*?([^.!?]*[.!?])', re.IGNORECASE)
+_INVREC_RE = re.compile(r'(?:recommend|recommendation):\s*(invest|pass|watch)', re.IGNORECASE)
+_THESIS_RE = re.compile(r'(?:thesis|key point)[s]?:\s*([^.!?]*[.!?])', re.IGNORECASE)
+_VAL_RE = re.compile(r'(?:valuation|value).*?([^.!?]*[.!?])', re.IGNORECASE)
+
+# Cheap keyword checks that gate the heavier patterns in the line-by-line parsers
+_REC_HINT_RE = re.compile(r'recommend|suggest|advise', re.IGNORECASE)
+_MIT_HINT_RE = re.compile(r'mitigate|reduce|address', re.IGNORECASE)
+_MIN_LINE_LEN = 4
+
+# Responses at least this long are parsed in a worker thread so the event
+# loop keeps draining other agents' streams meanwhile
+_THREADED_PARSE_MIN_CHARS = 2048
+
+# Agent prompt templates, rendered with str.format_map. Every prompt opens
+# with the same startup profile so the model server can reuse the prefill
+# for that shared prefix across the agents' calls
+_STARTUP_PROFILE = """
+Startup Profile:
+Company: {company_name}
+Founder: {founder_name}
+Description: {business_description}
+Industry: {industry}
+Funding Stage: {funding_stage}
+Team Size: {team_size}
+Website: {website_url}
+"""
+
+_DATA_COLLECTION_PROMPT = """
+As a data collection specialist, analyze the startup profile above and gather relevant public data.
+
+Please provide:
+1. Market size and growth potential
+2. Competitive landscape analysis
+3. Industry trends and opportunities
+4. Founder background and experience
+5. Company traction and milestones
+
+Format your response as structured JSON with clear categories and data points.
+"""
+
+_BUSINESS_ANALYSIS_PROMPT = """
+As a business analyst, evaluate the business model and strategy of the startup profiled above.
+
+Analyze:
+1. Business Model Viability
+2. Revenue Streams and Monetization
+3. Value Proposition and Differentiation
+4. Scalability and Growth Potential
+5. Market Positioning and Strategy
+
+Provide a structured analysis with scores (1-10) for each category and detailed reasoning.
+"""
+
+_RISK_ASSESSMENT_PROMPT = """
+As a risk assessment specialist, evaluate potential risks and challenges for the startup profiled above.
+
+Assess:
+1. Market Risks (competition, demand, timing)
+2. Technology Risks (scalability, security, obsolescence)
+3. Financial Risks (burn rate, funding, revenue)
+4. Team Risks (key person dependency, skills gap)
+5. Regulatory Risks (compliance, legal issues)
+
+Provide risk levels (Low/Medium/High) and mitigation strategies for each category.
+"""
+
+_INVESTMENT_INSIGHTS_PROMPT = """
+As an investment analyst, provide investment insights and recommendations for the startup profiled above.
+
+Provide:
+1. Investment Recommendation (Invest/Pass/Watch)
+2. Key Investment Thesis (3-5 bullet points)
+3. Valuation Considerations
+4. Due Diligence Priorities
+5. Exit Strategy Potential
+6. Timeline and Milestones
+
+Be specific and actionable in your recommendations.
+"""
+
+_INVESTMENT_REFINEMENT_PROMPT = """
+As an investment analyst, refine the preliminary investment view of the startup profiled above using the specialist findings.
+
+Preliminary View and Specialist Findings:
+{previous_analysis}
+
+Confirm or revise the preliminary recommendation and provide:
+1. Investment Recommendation (Invest/Pass/Watch)
+2. Key Investment Thesis (3-5 bullet points)
+3. Valuation Considerations
+4. Due Diligence Priorities
+5. Exit Strategy Potential
+6. Timeline and Milestones
+
+Be specific and actionable in your recommendations.
+"""
+
+def _prompt_fields(startup_data: "StartupData", **extra: Any) -> Dict[str, Any]:
+    """Template fields for a startup, with the display defaults the prompts expect"""
+    return {
+        **vars(startup_data),
+        "industry": startup_data.industry or "Not specified",
+        "website_url": startup_data.website_url or "Not provided",
+        "funding_stage": startup_data.funding_stage or "Not specified",
+        "team_size": startup_data.team_size or "Not specified",
+        **extra
+    }
+
+def _render_prompt(template: str, startup_data: "StartupData", **extra: Any) -> str:
+    """Render an agent template behind the shared startup profile prefix"""
+    fields = _prompt_fields(startup_data, **extra)
+    return _STARTUP_PROFILE.format_map(fields) + template.format_map(fields)
+
+def _loads(data: str) -> Any:
+    """Parse JSON text, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj: Any, indent: bool = True) -> str:
+    """Serialize to JSON text, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=str).decode()
+    if indent:
+        return json.dumps(obj, indent=2, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+class _JSONObjectScanner:
+    """Incremental brace-depth scanner for the first balanced {...} block in a text stream"""
+    
+    def __init__(self):
+        self.start = None
+        self.end = None
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, chunk: str) -> bool:
+        """Consume the next piece of text; returns True once the object is complete"""
+        if self.end is not None:
+            return True
+        
+        index = 0
+        if self.start is None:
+            index = chunk.find('{')
+            if index == -1:
+                self._offset += len(chunk)
+                return False
+            self.start = self._offset + index
+        
+        for index in range(index, len(chunk)):
+            char = chunk[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = self._offset + index + 1
+                    return True
+        
+        self._offset += len(chunk)
+        return False
+
+def _scan_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} block in text, ignoring braces inside strings"""
+    scanner = _JSONObjectScanner()
+    if scanner.feed(text):
+        return text[scanner.start:scanner.end]
+    return None
 
 @dataclass
 class StartupData:
@@ -27,6 +229,22 @@ class StartupData:
     industry: Optional[str] = None
     funding_stage: Optional[str] = None
     team_size: Optional[int] = None
+    
+    # StartupInput fields read by from_input; the API names differ for two of them
+    INPUT_FIELDS = {"company_name", "founder_name", "business_description", "pitch_deck_url", "website", "industry", "stage"}
+    
+    @classmethod
+    def from_input(cls, payload: Dict[str, Any]) -> "StartupData":
+        """Build from a dumped StartupInput API model"""
+        return cls(
+            company_name=payload["company_name"],
+            founder_name=payload.get("founder_name") or "Unknown",
+            business_description=payload["business_description"],
+            pitch_deck_url=payload.get("pitch_deck_url"),
+            website_url=payload.get("website"),
+            industry=payload.get("industry"),
+            funding_stage=payload.get("stage")
+        )
 
 @dataclass
 class AnalysisResult:
@@ -35,90 +253,225 @@ class AnalysisResult:
     analysis_type: str
     findings: Dict[str, Any]
     confidence_score: float
-    timestamp: datetime
+    timestamp: int  # nanoseconds since the epoch, from time.time_ns()
+    
+    @property
+    def iso_timestamp(self) -> str:
+        """UTC ISO-8601 rendering of the timestamp for display"""
+        return datetime.fromtimestamp(self.timestamp / 1e9, tz=timezone.utc).isoformat()
+
+@dataclass
+class AnalysisBatchResult:
+    """Column-oriented results of a batch run, one entry per startup in each column"""
+    company_names: List[str]
+    findings_by_agent: Dict[str, List[Dict[str, Any]]]
+    confidences: Dict[str, array]
+    
+    @classmethod
+    def from_results(cls, startups: List[StartupData],
+                     batch_results: List[Dict[str, AnalysisResult]]) -> "AnalysisBatchResult":
+        """Build the columns from per-startup result dicts"""
+        agent_keys = list(batch_results[0]) if batch_results else []
+        return cls(
+            company_names=[startup_data.company_name for startup_data in startups],
+            findings_by_agent={
+                agent_key: [results[agent_key].findings for results in batch_results]
+                for agent_key in agent_keys
+            },
+            confidences={
+                agent_key: array("f", (results[agent_key].confidence_score for results in batch_results))
+                for agent_key in agent_keys
+            }
+        )
+    
+    def to_json(self, indent: bool = False) -> str:
+        """Serialize the whole batch in one encoder call"""
+        return _dumps({
+            "company_names": self.company_names,
+            "findings_by_agent": self.findings_by_agent,
+            # Round away float32 noise such as 0.8500000238
+            "confidences": {
+                key: [round(value, 4) for value in values]
+                for key, values in self.confidences.items()
+            }
+        }, indent=indent)
+
+# SDK set-up is process wide. Vertex AI is initialised once; genai.configure
+# replaces the Google AI SDK's default clients, which models pick up on their
+# first call, so it runs once per event loop before that loop's models are built
+_VERTEX_INITED = False
+_GENAI_CONFIGURED_FOR = object()
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+@functools.lru_cache(maxsize=32)
+def _get_model(model_name: str, loop: Optional[asyncio.AbstractEventLoop]):
+    """Initialize the Google AI model once per model name and event loop and share it across agents
+    
+    The SDKs' async clients are grpc.aio channels tied to the loop they were
+    opened on, and the blocking wrappers start a fresh loop per run, so each
+    loop gets its own model objects (loop is None outside any loop).
+    """
+    global _VERTEX_INITED, _GENAI_CONFIGURED_FOR
+    project = os.getenv("GOOGLE_CLOUD_PROJECT")
+    if project:
+        # Vertex AI for production deployments with a GCP project
+        try:
+            if not _VERTEX_INITED:
+                vertexai.init(project=project, location="us-central1")
+                _VERTEX_INITED = True
+            model = GenerativeModel(model_name)
+            print(f"✅ {model_name}: Using Vertex AI")
+            return rate_limited(model)
+        except GoogleAuthError as e:
+            print(f"⚠️ {model_name}: Vertex AI credentials unavailable ({e}), falling back to Google AI SDK")
+    
+    # Google AI SDK with an API key
+    if _GENAI_CONFIGURED_FOR is not loop:
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        _GENAI_CONFIGURED_FOR = loop
+    model = genai.GenerativeModel(model_name)
+    print(f"✅ {model_name}: Using Google AI SDK")
+    return rate_limited(model)
 
 class BaseAnalystAgent:
     """Base class for all analyst agents"""
     
+    analysis_type = "base"
+    confidence_score = 0.0
+    
+    # Agents whose parser only needs the first JSON object can stop streaming there
+    stop_after_json = False
+    
+    # Findings forwarded to later agents; raw model text stays in the results only
+    summary_keys = ("scores", "risk_levels", "recommendation", "key_thesis")
+    
     def __init__(self, agent_name: str, model_name: str = "gemini-1.5-flash"):
         self.agent_name = agent_name
         self.model_name = model_name
-        self.model = None
-        self._initialize_model()
     
-    def _initialize_model(self):
-        """Initialize the Google AI model"""
+    @property
+    def model(self):
+        """The shared model for this agent's model name on the running event loop"""
+        return _get_model(self.model_name, _running_loop())
+    
+    def _build_prompt(self, startup_data: StartupData, context: Dict = None) -> str:
+        """Build the agent prompt - to be overridden"""
+        raise NotImplementedError("Subclasses must implement _build_prompt method")
+    
+    def _parse_response(self, response_text: str) -> Dict:
+        """Parse the model response - to be overridden"""
+        raise NotImplementedError("Subclasses must implement _parse_response method")
+    
+    def _summarize(self, findings: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact view of findings for downstream prompts"""
+        return {key: findings[key] for key in self.summary_keys if key in findings}
+    
+    def _make_result(self, findings: Dict[str, Any], confidence_score: float) -> AnalysisResult:
+        """Wrap findings in an AnalysisResult for this agent"""
+        return AnalysisResult(
+            agent_name=self.agent_name,
+            analysis_type=self.analysis_type,
+            findings=findings,
+            confidence_score=confidence_score,
+            timestamp=time.time_ns()
+        )
+    
+    def generate(self, prompt: str) -> str:
+        """Generate a response, serving repeated prompts from the LLM cache"""
+        key = llm_cache.cache_key(self.model_name, self.agent_name, prompt)
+        text = llm_cache.get(key)
+        if text is None:
+            text = self.model.generate_content(prompt).text
+            llm_cache.set(key, text)
+        return text
+    
+    async def agenerate(self, prompt: str) -> str:
+        """Async counterpart of generate"""
+        # Text cut off after the first JSON object must not be served as a full answer
+        agent = f"{self.agent_name}:first_json" if self.stop_after_json else self.agent_name
+        key = llm_cache.cache_key(self.model_name, agent, prompt)
+        text = llm_cache.get(key)
+        if text is None:
+            text = await self._astream(prompt)
+            llm_cache.set(key, text)
+        return text
+    
+    async def _astream(self, prompt: str) -> str:
+        """Stream the response so parsing can start before the last chunk arrives"""
+        scanner = _JSONObjectScanner() if self.stop_after_json else None
+        parts = []
+        
+        stream = self.model.stream_content_async(prompt)
         try:
-            # Try Vertex AI first (for production)
-            vertexai.init(project=os.getenv("GOOGLE_CLOUD_PROJECT"), location="us-central1")
-            self.model = GenerativeModel(self.model_name)
-            print(f"✅ {self.agent_name}: Using Vertex AI")
-        except Exception:
-            # Fallback to Google AI SDK
-            genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-            self.model = genai.GenerativeModel(self.model_name)
-            print(f"✅ {self.agent_name}: Using Google AI SDK")
+            async for chunk in stream:
+                parts.append(chunk.text)
+                if scanner is not None and scanner.feed(chunk.text):
+                    # The parser has everything it needs; skip the trailing prose
+                    break
+        finally:
+            # Close now so an early stop releases the model call and its connection
+            await stream.aclose()
+        
+        return "".join(parts)
     
     def analyze(self, startup_data: StartupData, context: Dict = None) -> AnalysisResult:
-        """Base analysis method to be overridden"""
-        raise NotImplementedError("Subclasses must implement analyze method")
+        """Run the agent and block until the model responds"""
+        prompt = self._build_prompt(startup_data, context)
+        
+        try:
+            response_text = self.generate(prompt)
+            return self._make_result(self._parse_response(response_text), self.confidence_score)
+        except Exception as e:
+            return self._make_result({"error": str(e)}, 0.0)
+    
+    async def aanalyze(self, startup_data: StartupData, context: Dict = None) -> AnalysisResult:
+        """Run the agent on the event loop so independent agents can overlap"""
+        prompt = self._build_prompt(startup_data, context)
+        
+        try:
+            response_text = await self.agenerate(prompt)
+            if len(response_text) < _THREADED_PARSE_MIN_CHARS:
+                findings = self._parse_response(response_text)
+            else:
+                findings = await asyncio.to_thread(self._parse_response, response_text)
+            return self._make_result(findings, self.confidence_score)
+        except Exception as e:
+            return self._make_result({"error": str(e)}, 0.0)
 
 class DataExtractionAgent(BaseAnalystAgent):
     """Agent responsible for extracting and structuring pitch deck content"""
     
+    analysis_type = "data_collection"
+    confidence_score = 0.85
+    stop_after_json = True
+    
     def __init__(self):
         super().__init__("Data Extraction Agent")
     
-    def analyze(self, startup_data: StartupData, context: Dict = None) -> AnalysisResult:
+    def _build_prompt(self, startup_data: StartupData, context: Dict = None) -> str:
         """Collect and synthesize startup data"""
-        
-        prompt = f"""
-        As a data collection specialist, analyze the following startup information and gather relevant public data:
-        
-        Company: {startup_data.company_name}
-        Founder: {startup_data.founder_name}
-        Description: {startup_data.business_description}
-        Industry: {startup_data.industry or 'Not specified'}
-        Website: {startup_data.website_url or 'Not provided'}
-        
-        Please provide:
-        1. Market size and growth potential
-        2. Competitive landscape analysis
-        3. Industry trends and opportunities
-        4. Founder background and experience
-        5. Company traction and milestones
-        
-        Format your response as structured JSON with clear categories and data points.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            findings = self._parse_response(response.text)
-            
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="data_collection",
-                findings=findings,
-                confidence_score=0.85,
-                timestamp=datetime.now()
-            )
-        except Exception as e:
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="data_collection",
-                findings={"error": str(e)},
-                confidence_score=0.0,
-                timestamp=datetime.now()
-            )
+        return _render_prompt(_DATA_COLLECTION_PROMPT, startup_data)
     
     def _parse_response(self, response_text: str) -> Dict:
         """Parse the AI response into structured data"""
         try:
-            # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            # Try to extract JSON from response with a single linear scan
+            json_text = _scan_json_object(response_text)
+            if json_text is not None:
+                try:
+                    return _loads(json_text)
+                except ValueError:
+                    pass
+            
+            # Fall back to the greedy regex for unbalanced output
+            json_match = _JSON_RE.search(response_text)
             if json_match:
-                return json.loads(json_match.group())
+                return _loads(json_match.group())
             else:
                 # Fallback to structured text parsing
                 return {
@@ -127,156 +480,98 @@ class DataExtractionAgent(BaseAnalystAgent):
                 }
         except:
             return {"raw_analysis": response_text, "parsed": False}
+    
+    def _summarize(self, findings: Dict[str, Any]) -> Dict[str, Any]:
+        """Forward the structured market data, or a short snippet when the JSON did not parse"""
+        summary = {key: value for key, value in findings.items() if key not in ("raw_analysis", "parsed")}
+        if "raw_analysis" in findings:
+            summary["market_snippet"] = findings["raw_analysis"][:500]
+        return summary
 
 class BusinessAnalysisAndMappingAgent(BaseAnalystAgent):
     """Agent for analyzing business model and mapping evaluation parameters"""
     
+    analysis_type = "business_analysis"
+    confidence_score = 0.90
+    
     def __init__(self):
         super().__init__("Business Analysis & Mapping Agent")
     
-    def analyze(self, startup_data: StartupData, context: Dict = None) -> AnalysisResult:
+    def _build_prompt(self, startup_data: StartupData, context: Dict = None) -> str:
         """Analyze business model and strategy"""
-        
-        prompt = f"""
-        As a business analyst, evaluate the following startup's business model and strategy:
-        
-        Company: {startup_data.company_name}
-        Description: {startup_data.business_description}
-        Industry: {startup_data.industry or 'Not specified'}
-        Funding Stage: {startup_data.funding_stage or 'Not specified'}
-        
-        Analyze:
-        1. Business Model Viability
-        2. Revenue Streams and Monetization
-        3. Value Proposition and Differentiation
-        4. Scalability and Growth Potential
-        5. Market Positioning and Strategy
-        
-        Provide a structured analysis with scores (1-10) for each category and detailed reasoning.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            findings = self._parse_business_analysis(response.text)
-            
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="business_analysis",
-                findings=findings,
-                confidence_score=0.90,
-                timestamp=datetime.now()
-            )
-        except Exception as e:
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="business_analysis",
-                findings={"error": str(e)},
-                confidence_score=0.0,
-                timestamp=datetime.now()
-            )
+        return _render_prompt(_BUSINESS_ANALYSIS_PROMPT, startup_data)
+    
+    def _parse_response(self, response_text: str) -> Dict:
+        return self._parse_business_analysis(response_text)
     
     def _parse_business_analysis(self, response_text: str) -> Dict:
-        """Parse business analysis response"""
+        """Parse business analysis response in a single pass over its lines"""
+        scores = {}
+        recommendations = []
+        for line in response_text.splitlines():
+            if len(line) < _MIN_LINE_LEN:
+                continue
+            if "/10" in line:
+                for category, score in _SCORE_RE.findall(line):
+                    scores[category.strip()] = int(score)
+            if len(recommendations) < 5 and _REC_HINT_RE.search(line):
+                recommendations.extend(_REC_RE.findall(line))
+        
         return {
             "analysis": response_text,
-            "scores": self._extract_scores(response_text),
-            "recommendations": self._extract_recommendations(response_text)
+            "scores": scores,
+            "recommendations": recommendations[:5]  # Top 5 recommendations
         }
     
-    def _extract_scores(self, text: str) -> Dict:
-        """Extract numerical scores from analysis"""
-        import re
-        scores = {}
-        score_pattern = r'(\w+.*?):\s*(\d+)/10'
-        matches = re.findall(score_pattern, text, re.IGNORECASE)
-        for category, score in matches:
-            scores[category.strip()] = int(score)
-        return scores
-    
-    def _extract_recommendations(self, text: str) -> List[str]:
-        """Extract recommendations from analysis"""
-        import re
-        recommendations = []
-        rec_pattern = r'(?:recommend|suggest|advise).*?([^.!?]*[.!?])'
-        matches = re.findall(rec_pattern, text, re.IGNORECASE)
-        return matches[:5]  # Top 5 recommendations
+    def _summarize(self, findings: Dict[str, Any]) -> Dict[str, Any]:
+        """Scores plus the top recommendations; the full analysis text stays in the results"""
+        summary = super()._summarize(findings)
+        if "recommendations" in findings:
+            summary["recommendations"] = findings["recommendations"][:3]
+        return summary
 
 class RiskAssessmentAgent(BaseAnalystAgent):
     """Agent for assessing risks and challenges"""
     
+    analysis_type = "risk_assessment"
+    confidence_score = 0.88
+    
     def __init__(self):
         super().__init__("Risk Assessment Agent")
     
-    def analyze(self, startup_data: StartupData, context: Dict = None) -> AnalysisResult:
+    def _build_prompt(self, startup_data: StartupData, context: Dict = None) -> str:
         """Assess risks and challenges"""
-        
-        prompt = f"""
-        As a risk assessment specialist, evaluate potential risks and challenges for this startup:
-        
-        Company: {startup_data.company_name}
-        Description: {startup_data.business_description}
-        Industry: {startup_data.industry or 'Not specified'}
-        Team Size: {startup_data.team_size or 'Not specified'}
-        
-        Assess:
-        1. Market Risks (competition, demand, timing)
-        2. Technology Risks (scalability, security, obsolescence)
-        3. Financial Risks (burn rate, funding, revenue)
-        4. Team Risks (key person dependency, skills gap)
-        5. Regulatory Risks (compliance, legal issues)
-        
-        Provide risk levels (Low/Medium/High) and mitigation strategies for each category.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            findings = self._parse_risk_analysis(response.text)
-            
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="risk_assessment",
-                findings=findings,
-                confidence_score=0.88,
-                timestamp=datetime.now()
-            )
-        except Exception as e:
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="risk_assessment",
-                findings={"error": str(e)},
-                confidence_score=0.0,
-                timestamp=datetime.now()
-            )
+        return _render_prompt(_RISK_ASSESSMENT_PROMPT, startup_data)
+    
+    def _parse_response(self, response_text: str) -> Dict:
+        return self._parse_risk_analysis(response_text)
     
     def _parse_risk_analysis(self, response_text: str) -> Dict:
-        """Parse risk analysis response"""
+        """Parse risk analysis response in a single pass over its lines"""
+        risks = {}
+        strategies = []
+        for line in response_text.splitlines():
+            if len(line) < _MIN_LINE_LEN:
+                continue
+            lowered = line.lower()
+            if "risk" in lowered:
+                for risk_type, level in _RISK_RE.findall(line):
+                    risks[risk_type.strip()] = level.lower()
+            if len(strategies) < 5 and _MIT_HINT_RE.search(line):
+                strategies.extend(_MIT_RE.findall(line))
+        
         return {
             "risk_analysis": response_text,
-            "risk_levels": self._extract_risk_levels(response_text),
-            "mitigation_strategies": self._extract_mitigation_strategies(response_text)
+            "risk_levels": risks,
+            "mitigation_strategies": strategies[:5]
         }
-    
-    def _extract_risk_levels(self, text: str) -> Dict:
-        """Extract risk levels from analysis"""
-        import re
-        risks = {}
-        risk_pattern = r'(\w+.*?)\s*risk[s]?:\s*(low|medium|high)'
-        matches = re.findall(risk_pattern, text, re.IGNORECASE)
-        for risk_type, level in matches:
-            risks[risk_type.strip()] = level.lower()
-        return risks
-    
-    def _extract_mitigation_strategies(self, text: str) -> List[str]:
-        """Extract mitigation strategies"""
-        import re
-        strategies = []
-        strategy_pattern = r'(?:mitigate|reduce|address).*?([^.!?]*[.!?])'
-        matches = re.findall(strategy_pattern, text, re.IGNORECASE)
-        return matches[:5]
 
 class SchedulingAndInterviewAgent(BaseAnalystAgent):
     """Agent for post-analysis founder interviews when investors need additional details"""
     
+    analysis_type = "scheduling_interview"
+    confidence_score = 0.75  # Lower confidence since it's placeholder
+    
     def __init__(self):
         super().__init__("Scheduling & Interview Agent")
     
@@ -299,7 +594,7 @@ class SchedulingAndInterviewAgent(BaseAnalystAgent):
             "typical_questions": [
                 "Financial projections deep-dive",
                 "Team expansion plans",
-                "Technology roadmap details", 
+                "Technology roadmap details",
                 "Market penetration strategy",
                 "Competitive positioning clarification",
                 "Partnership and customer acquisition details"
@@ -313,65 +608,45 @@ class SchedulingAndInterviewAgent(BaseAnalystAgent):
             "demo_note": "This agent activates when investors need clarification post-analysis - Production version will conduct live AI interviews"
         }
         
-        return AnalysisResult(
-            agent_name=self.agent_name,
-            analysis_type="scheduling_interview",
-            findings=mock_findings,
-            confidence_score=0.75,  # Lower confidence since it's placeholder
-            timestamp=datetime.now()
-        )
+        return self._make_result(mock_findings, self.confidence_score)
+    
+    async def aanalyze(self, startup_data: StartupData, context: Dict = None) -> AnalysisResult:
+        """Mock agent makes no model call, so there is nothing to await"""
+        return self.analyze(startup_data, context)
 
 class RefinementAndInvestmentInsightsAgent(BaseAnalystAgent):
     """Agent for refining analysis and generating final investment insights and memos"""
     
+    analysis_type = "investment_insights"
+    confidence_score = 0.92
+    
     def __init__(self):
         super().__init__("Refinement & Investment Insights Agent")
     
-    def analyze(self, startup_data: StartupData, context: Dict = None) -> AnalysisResult:
+    def _build_prompt(self, startup_data: StartupData, context: Dict = None) -> str:
         """Generate investment insights and recommendations"""
         
-        # Combine previous analysis results
-        previous_analysis = context.get("previous_analysis", {}) if context else {}
-        
-        prompt = f"""
-        As an investment analyst, provide investment insights and recommendations for this startup:
-        
-        Company: {startup_data.company_name}
-        Description: {startup_data.business_description}
-        
-        Previous Analysis Results:
-        {json.dumps(previous_analysis, indent=2)}
-        
-        Provide:
-        1. Investment Recommendation (Invest/Pass/Watch)
-        2. Key Investment Thesis (3-5 bullet points)
-        3. Valuation Considerations
-        4. Due Diligence Priorities
-        5. Exit Strategy Potential
-        6. Timeline and Milestones
+        # Without earlier findings this is the preliminary pass from the startup data alone
+        previous_analysis = context.get("previous_analysis") if context else None
+        if not previous_analysis:
+            return _render_prompt(_INVESTMENT_INSIGHTS_PROMPT, startup_data)
         
-        Be specific and actionable in your recommendations.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            findings = self._parse_investment_insights(response.text)
-            
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="investment_insights",
-                findings=findings,
-                confidence_score=0.92,
-                timestamp=datetime.now()
-            )
-        except Exception as e:
-            return AnalysisResult(
-                agent_name=self.agent_name,
-                analysis_type="investment_insights",
-                findings={"error": str(e)},
-                confidence_score=0.0,
-                timestamp=datetime.now()
-            )
+        # Compact JSON: indentation only adds prompt tokens
+        return _render_prompt(
+            _INVESTMENT_REFINEMENT_PROMPT, startup_data,
+            previous_analysis=_dumps(previous_analysis, indent=False)
+        )
+    
+    async def analyze_preliminary(self, startup_data: StartupData) -> AnalysisResult:
+        """Investment view from the startup data alone, so it can run alongside the other agents"""
+        return await self.aanalyze(startup_data)
+    
+    async def refine(self, startup_data: StartupData, prior_findings: Dict[str, Any]) -> AnalysisResult:
+        """Revise the preliminary view once the other agents' findings are in"""
+        return await self.aanalyze(startup_data, {"previous_analysis": prior_findings})
+    
+    def _parse_response(self, response_text: str) -> Dict:
+        return self._parse_investment_insights(response_text)
     
     def _parse_investment_insights(self, response_text: str) -> Dict:
         """Parse investment insights response"""
@@ -384,31 +659,30 @@ class RefinementAndInvestmentInsightsAgent(BaseAnalystAgent):
     
     def _extract_recommendation(self, text: str) -> str:
         """Extract investment recommendation"""
-        import re
-        rec_pattern = r'(?:recommend|recommendation):\s*(invest|pass|watch)'
-        match = re.search(rec_pattern, text, re.IGNORECASE)
+        match = _INVREC_RE.search(text)
         return match.group(1).lower() if match else "unknown"
     
     def _extract_key_thesis(self, text: str) -> List[str]:
         """Extract key investment thesis points"""
-        import re
-        thesis_points = []
-        thesis_pattern = r'(?:thesis|key point)[s]?:\s*([^.!?]*[.!?])'
-        matches = re.findall(thesis_pattern, text, re.IGNORECASE)
-        return matches[:5]
+        return _THESIS_RE.findall(text)[:5]
     
     def _extract_valuation_considerations(self, text: str) -> List[str]:
         """Extract valuation considerations"""
-        import re
-        valuation_points = []
-        val_pattern = r'(?:valuation|value).*?([^.!?]*[.!?])'
-        matches = re.findall(val_pattern, text, re.IGNORECASE)
-        return matches[:3]
+        return _VAL_RE.findall(text)[:3]
+
+# Agents that only need the startup data and can run side by side
+INDEPENDENT_AGENTS = ("data_collection", "business_analysis", "risk_assessment")
+
+# Called with (agent_key, result) as each agent's final result becomes available
+AgentCallback = Callable[[str, AnalysisResult], None]
 
 class StartupAnalystOrchestrator:
     """Orchestrator for coordinating all analyst agents"""
     
-    def __init__(self):
+    def __init__(self, refine_insights: bool = True):
+        # Without refinement the preliminary investment view is final and the
+        # whole analysis is a single round of model calls
+        self.refine_insights = refine_insights
         self.agents = {
             "data_collection": DataExtractionAgent(),
             "business_analysis": BusinessAnalysisAndMappingAgent(),
@@ -417,39 +691,137 @@ class StartupAnalystOrchestrator:
             "investment_insights": RefinementAndInvestmentInsightsAgent()
         }
         self.analysis_results = {}
+        self.batch_results = None
     
-    def analyze_startup(self, startup_data: StartupData) -> Dict[str, AnalysisResult]:
+    async def aanalyze_startup(self, startup_data: StartupData,
+                               on_agent_complete: Optional[AgentCallback] = None) -> Dict[str, AnalysisResult]:
         """Run complete startup analysis using all agents"""
         
         print(f"🚀 Starting analysis for {startup_data.company_name}")
         
-        # Run agents in sequence
-        results = {}
-        context = {}
+        investment_agent = self.agents["investment_insights"]
+        
+        # 1-4. Every agent only needs the startup data, so data collection,
+        # business analysis, risk assessment and a preliminary investment view
+        # all run concurrently
+        print("📊 Collecting data, analyzing business model, assessing risks and drafting investment view...")
+        stage_one = await asyncio.gather(
+            *(
+                self._reporting(agent_key, self.agents[agent_key].aanalyze(startup_data), on_agent_complete)
+                for agent_key in INDEPENDENT_AGENTS
+            ),
+            self._reporting(
+                "investment_insights",
+                investment_agent.analyze_preliminary(startup_data),
+                None if self.refine_insights else on_agent_complete
+            )
+        )
+        results = dict(zip(INDEPENDENT_AGENTS + ("investment_insights",), stage_one))
+        
+        # 5. Refine the investment view with the other agents' findings
+        if self.refine_insights:
+            print("💰 Refining investment insights...")
+            results["investment_insights"] = await self._reporting(
+                "investment_insights",
+                investment_agent.refine(startup_data, self._summarize_findings(results)),
+                on_agent_complete
+            )
         
-        # 1. Data Collection
-        print("📊 Collecting data...")
-        results["data_collection"] = self.agents["data_collection"].analyze(startup_data, context)
-        context["previous_analysis"] = results["data_collection"].findings
+        self.analysis_results = results
+        print("✅ Analysis complete!")
         
-        # 2. Business Analysis
-        print("💼 Analyzing business model...")
-        results["business_analysis"] = self.agents["business_analysis"].analyze(startup_data, context)
-        context["previous_analysis"].update(results["business_analysis"].findings)
+        return results
+    
+    def analyze_startup(self, startup_data: StartupData) -> Dict[str, AnalysisResult]:
+        """Blocking wrapper for scripts; await aanalyze_startup from async code"""
+        return asyncio.run(self.aanalyze_startup(startup_data))
+    
+    async def aanalyze_many(self, startups: List[StartupData],
+                            on_agent_complete: Optional[Sequence[Optional[AgentCallback]]] = None
+                            ) -> List[Dict[str, AnalysisResult]]:
+        """Analyze a batch of startups, running each pipeline stage across the whole batch
         
-        # 3. Risk Assessment
-        print("⚠️ Assessing risks...")
-        results["risk_assessment"] = self.agents["risk_assessment"].analyze(startup_data, context)
-        context["previous_analysis"].update(results["risk_assessment"].findings)
+        on_agent_complete, if given, holds one optional callback per startup.
+        """
         
-        # 4. Investment Insights
-        print("💰 Generating investment insights...")
-        results["investment_insights"] = self.agents["investment_insights"].analyze(startup_data, context)
+        print(f"🚀 Starting batch analysis for {len(startups)} startups")
         
-        self.analysis_results = results
-        print("✅ Analysis complete!")
+        investment_agent = self.agents["investment_insights"]
+        stage_keys = INDEPENDENT_AGENTS + ("investment_insights",)
+        callbacks = list(on_agent_complete) if on_agent_complete else [None] * len(startups)
         
-        return results
+        # Stage 1: every agent, including the preliminary investment view, for
+        # every startup in a single fan-out
+        print("📊 Running data collection, business analysis, risk assessment and preliminary insights...")
+        stage_one = await asyncio.gather(*(
+            self._reporting(
+                "investment_insights",
+                investment_agent.analyze_preliminary(startup_data),
+                None if self.refine_insights else callback
+            )
+            if agent_key == "investment_insights"
+            else self._reporting(agent_key, self.agents[agent_key].aanalyze(startup_data), callback)
+            for startup_data, callback in zip(startups, callbacks)
+            for agent_key in stage_keys
+        ))
+        batch_results = [
+            dict(zip(stage_keys, stage_one[i:i + len(stage_keys)]))
+            for i in range(0, len(stage_one), len(stage_keys))
+        ]
+        
+        # Stage 2: refine every investment view once its startup's findings are joined
+        if self.refine_insights:
+            print("💰 Refining investment insights...")
+            insights = await asyncio.gather(*(
+                self._reporting(
+                    "investment_insights",
+                    investment_agent.refine(startup_data, self._summarize_findings(results)),
+                    callback
+                )
+                for startup_data, results, callback in zip(startups, batch_results, callbacks)
+            ))
+            for results, insight in zip(batch_results, insights):
+                results["investment_insights"] = insight
+        
+        self.batch_results = AnalysisBatchResult.from_results(startups, batch_results)
+        print("✅ Batch analysis complete!")
+        return batch_results
+    
+    def analyze_many(self, startups: List[StartupData]) -> List[Dict[str, AnalysisResult]]:
+        """Blocking wrapper for scripts; await aanalyze_many from async code"""
+        return asyncio.run(self.aanalyze_many(startups))
+    
+    async def warm_up(self):
+        """Open each model's connection and fetch its credentials without generating anything"""
+        # Agents on the same model name share one model object per loop
+        models = {id(agent.model): agent.model for agent in self.agents.values()}
+        await asyncio.gather(*(model.count_tokens_async("warm-up") for model in models.values()))
+    
+    def get_agent_status(self) -> Dict[str, Any]:
+        """Static description of the configured agents; makes no model calls"""
+        return {
+            "orchestrator_initialized": True,
+            "total_agents": len(self.agents),
+            "agents": {
+                agent_key: {"name": agent.agent_name, "model": agent.model_name}
+                for agent_key, agent in self.agents.items()
+            }
+        }
+    
+    @staticmethod
+    async def _reporting(agent_key: str, analysis, on_agent_complete: Optional[AgentCallback]) -> AnalysisResult:
+        """Await an agent run and report its result to the progress callback"""
+        result = await analysis
+        if on_agent_complete is not None:
+            on_agent_complete(agent_key, result)
+        return result
+    
+    def _summarize_findings(self, results: Dict[str, AnalysisResult]) -> Dict[str, Dict[str, Any]]:
+        """Per-agent summaries of the stage one findings for the refinement pass"""
+        return {
+            agent_key: self.agents[agent_key]._summarize(result.findings)
+            for agent_key, result in results.items()
+        }
     
     def generate_summary_report(self) -> str:
         """Generate a summary report from all analysis results"""
@@ -460,7 +832,7 @@ class StartupAnalystOrchestrator:
         summary_prompt = f"""
         Create a comprehensive executive summary report for startup analysis based on these results:
         
-        {json.dumps(self.analysis_results, indent=2, default=str)}
+        {_dumps(self.analysis_results)}
         
         Include:
         1. Executive Summary
@@ -474,8 +846,7 @@ class StartupAnalystOrchestrator:
         
         try:
             # Use the investment insights agent for final summary
-            response = self.agents["investment_insights"].model.generate_content(summary_prompt)
-            return response.text
+            return self.agents["investment_insights"].generate(summary_prompt)
         except Exception as e:
             return f"Error generating summary: {str(e)}"
 
@@ -1,18 +1,23 @@
 """
 Enhanced FastAPI backend with comprehensive Google Tech Stack integration
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks, File, UploadFile, Form
+from fastapi import FastAPI, HTTPException, BackgroundTasks, File, UploadFile, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 import uvicorn
 import asyncio
+import hashlib
 import time
+import orjson
+import secrets
 import sys
 import os
 from typing import Dict, Any, List, Optional
 import logging
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
 # Add src to path
 sys.path.append('src')
@@ -20,17 +25,114 @@ sys.path.append('src')
 # Use working agents instead of problematic Google ADK
 import sys
 sys.path.append('.')
-from agents.startup_analyst_agents import StartupAnalystOrchestrator
-google_adk_orchestrator = StartupAnalystOrchestrator()
-from src.agents.multimodal_ingestion_agent import multimodal_processor, deal_memo_generator
-from src.utils.enhanced_firebase_client import enhanced_firebase_client
-from src.utils.enhanced_storage_client import enhanced_storage_client
 from src.models.startup import StartupInput
+from agents.progress_stream import ProgressRegistry
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Progress streaming: agents reported per analysis, plus the final report step
+PROGRESS_AGENTS = ("data_collection", "business_analysis", "risk_assessment", "investment_insights")
+PROGRESS_STEPS = PROGRESS_AGENTS + ("report_generation",)
+PROGRESS_HEARTBEAT_SECONDS = 15
+PROGRESS_STREAM_TIMEOUT_SECONDS = 600
+
+# Demo scenarios change rarely; the serialized response is reused for this long
+DEMO_SCENARIOS_TTL_SECONDS = 300
+_demo_scenarios_cache = (None, None, 0.0)
+
+DEFAULT_DEMO_SCENARIOS = [
+    {
+        "company_name": "MedAI Solutions",
+        "industry": "Healthcare Technology",
+        "stage": "Series A",
+        "description": "AI-powered diagnostic platform for radiology",
+        "funding_request": "$5M",
+        "key_metrics": "200+ hospitals using platform, 95% accuracy rate"
+    },
+    {
+        "company_name": "EcoTransport",
+        "industry": "Clean Technology", 
+        "stage": "Seed",
+        "description": "Electric vehicle charging network with renewable energy",
+        "funding_request": "$2.5M",
+        "key_metrics": "50 charging stations deployed, partnerships with 3 cities"
+    },
+    {
+        "company_name": "FinanceFlow",
+        "industry": "Financial Technology",
+        "stage": "Series B", 
+        "description": "Automated financial planning for small businesses",
+        "funding_request": "$15M",
+        "key_metrics": "10,000+ SMB customers, $500K monthly recurring revenue"
+    }
+]
+
+# The agents and Google clients are slow to import and build, so they are
+# loaded on first use (or by the startup warm-up) rather than at import time;
+# health probes and static files never wait for them
+@lru_cache(maxsize=1)
+def get_orchestrator():
+    # Use working agents instead of problematic Google ADK
+    from agents.startup_analyst_agents import StartupAnalystOrchestrator
+    return StartupAnalystOrchestrator()
+
+@lru_cache(maxsize=1)
+def get_agent_status() -> Dict[str, Any]:
+    # Agent status is fixed once the orchestrator is built, so compute it once
+    return get_orchestrator().get_agent_status()
+
+@lru_cache(maxsize=1)
+def get_multimodal_processor():
+    from src.agents.multimodal_ingestion_agent import multimodal_processor
+    return multimodal_processor
+
+@lru_cache(maxsize=1)
+def get_deal_memo_generator():
+    from src.agents.multimodal_ingestion_agent import deal_memo_generator
+    return deal_memo_generator
+
+@lru_cache(maxsize=1)
+def get_firebase_client():
+    from src.utils.enhanced_firebase_client import enhanced_firebase_client
+    return enhanced_firebase_client
+
+@lru_cache(maxsize=1)
+def get_storage_client():
+    from src.utils.enhanced_storage_client import enhanced_storage_client
+    return enhanced_storage_client
+
+def _loaded(factory) -> bool:
+    """Whether a lazy factory has already built its object"""
+    return factory.cache_info().currsize > 0
+
+def warm_up():
+    """Load the agents and Google clients ahead of the first request"""
+    try:
+        logger.info(f"Firebase Available: {get_firebase_client().is_available()}")
+        logger.info(f"Cloud Storage Available: {get_storage_client().is_available()}")
+        get_multimodal_processor()
+        get_deal_memo_generator()
+        logger.info(f"Google ADK: {get_agent_status()['total_agents']} agents initialized")
+    except Exception as e:
+        # Endpoints retry the load on first use and report the error there
+        logger.error(f"Warm-up failed: {str(e)}")
+
+# Data that changes on human time-scales is revalidated with an ETag so
+# repeat fetches get an empty 304 instead of the full body
+REVALIDATE_CACHE_CONTROL = "private, max-age=60, must-revalidate"
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+def _etag_response(request: Request, body: bytes, etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    """JSON body with validators, or 304 Not Modified when the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag in request.headers.get("if-none-match", "").split(", "):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -38,115 +140,126 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting Enhanced Startup Analyst Platform with Google Tech Stack...")
     
-    # Initialize Google services
-    logger.info(f"Firebase Available: {enhanced_firebase_client.is_available()}")
-    logger.info(f"Cloud Storage Available: {enhanced_storage_client.is_available()}")
+    if os.getenv("DEV"):
+        # Log any callback that holds the event loop for more than 100 ms;
+        # asyncio only checks this in debug mode
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.1
     
-    # Check Google ADK status
-    adk_status = google_adk_orchestrator.get_agent_status()
-    logger.info(f"Google ADK: {adk_status['total_agents']} agents initialized")
+    # Load the Google services in the background so startup is not held up
+    app.state.warm_up = asyncio.create_task(asyncio.to_thread(warm_up))
     
-    # Start keep-alive task
-    keep_alive_task = asyncio.create_task(keep_alive_worker())
+    # Latest progress event per analysis, pushed to its SSE streams
+    app.state.progress = ProgressRegistry()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Enhanced Startup Analyst Platform...")
-    keep_alive_task.cancel()
 
 # Create FastAPI app
 app = FastAPI(
     title="Enhanced Startup Analyst Platform",
     description="Comprehensive Google Tech Stack AI-Powered Investment Analysis",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson renders the large nested analysis findings several times faster
+    default_response_class=ORJSONResponse
 )
 
+FRONTEND_BUILT = os.path.exists("frontend/build")
+FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN")
+
 # CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3001", "http://localhost:3000", "*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# The built React app is served from this same origin and needs no CORS; only
+# a separately hosted frontend (dev server or FRONTEND_ORIGIN) does
+if FRONTEND_ORIGIN or not FRONTEND_BUILT:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=(FRONTEND_ORIGIN or "http://localhost:3001,http://localhost:3000").split(","),
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["Content-Type", "Authorization"],
+        # Let browsers cache the preflight for a day
+        max_age=86400,
+    )
 
-# Serve React frontend
-if os.path.exists("frontend/build"):
-    # Mount static assets (JS, CSS)
-    if os.path.exists("frontend/build/static"):
-        app.mount("/static", StaticFiles(directory="frontend/build/static"), name="static")
-    
-    # Serve other assets (favicon, manifest, logos) directly from build
-    @app.get("/favicon.ico")
-    async def serve_favicon():
-        return FileResponse("frontend/build/favicon.ico")
-    
-    @app.get("/manifest.json")
-    async def serve_manifest():
-        return FileResponse("frontend/build/manifest.json")
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that stamps every file response with a fixed Cache-Control header"""
     
-    @app.get("/logo192.png")
-    async def serve_logo192():
-        return FileResponse("frontend/build/logo192.png")
+    def __init__(self, *args, cache_control: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
     
-    @app.get("/logo512.png")
-    async def serve_logo512():
-        return FileResponse("frontend/build/logo512.png")
-    
-    @app.get("/robots.txt")
-    async def serve_robots():
-        return FileResponse("frontend/build/robots.txt")
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
+
+class SPAStaticFiles(CachedStaticFiles):
+    """Serves the React build, falling back to index.html for client-side routes"""
     
+    async def get_response(self, path: str, scope):
+        try:
+            response = await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            # Unknown API paths are real 404s, not client-side routes
+            if e.status_code != 404 or path.split(os.sep, 1)[0] == "api":
+                raise
+            response = None
+        if response is None or response.status_code == 404:
+            response = await super().get_response("index.html", scope)
+        if response.headers.get("content-type", "").startswith("text/html"):
+            # index.html changes with every build; it must always be revalidated
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+# Serve React frontend
+if FRONTEND_BUILT:
+    # Hashed JS/CSS bundles never change for a given URL
+    if os.path.exists("frontend/build/static"):
+        app.mount(
+            "/static",
+            CachedStaticFiles(
+                directory="frontend/build/static",
+                cache_control="public, max-age=31536000, immutable"
+            ),
+            name="static"
+        )
     logger.info("✅ React frontend static files mounted")
 else:
     logger.warning("⚠️ React frontend not built. Run 'npm run build' in frontend directory.")
 
-async def keep_alive_worker():
-    """Keep the service alive with periodic health checks"""
-    import httpx
-    
-    while True:
-        try:
-            await asyncio.sleep(300)  # 5 minutes
-            async with httpx.AsyncClient() as client:
-                response = await client.get("http://localhost:8080/api/health")
-                if response.status_code == 200:
-                    logger.info("Keep-alive ping successful")
-                else:
-                    logger.warning(f"Keep-alive ping failed: {response.status_code}")
-        except Exception as e:
-            logger.error(f"Keep-alive error: {str(e)}")
-
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "timestamp": time.time(),
+        # Report only what is already loaded; a probe must not trigger the load
         "services": {
-            "firebase": enhanced_firebase_client.is_available(),
-            "storage": enhanced_storage_client.is_available(),
-            "google_adk": google_adk_orchestrator.get_agent_status()["orchestrator_initialized"]
+            "firebase": _loaded(get_firebase_client) and get_firebase_client().is_available(),
+            "storage": _loaded(get_storage_client) and get_storage_client().is_available(),
+            "google_adk": _loaded(get_agent_status) and get_agent_status()["orchestrator_initialized"]
         }
     }
 
 @app.get("/api/status")
 async def get_status():
     """Get comprehensive system status"""
-    adk_status = {"orchestrator_initialized": True, "total_agents": len(google_adk_orchestrator.agents)}
+    adk_status = get_agent_status()
     
     return {
         "platform": "Enhanced Startup Analyst Platform",
         "version": "2.0.0",
         "google_tech_stack": {
             "firebase": {
-                "available": enhanced_firebase_client.is_available(),
+                "available": get_firebase_client().is_available(),
                 "description": "Real-time collaboration and data storage"
             },
             "cloud_storage": {
-                "available": enhanced_storage_client.is_available(),
+                "available": get_storage_client().is_available(),
                 "description": "File upload and document management"
             },
             "google_adk": {
@@ -164,37 +277,84 @@ async def get_status():
         ]
     }
 
+def _progress_event(startup_id: str, agents_completed: List[str], status: str) -> Dict[str, Any]:
+    """Progress snapshot in the shape the frontend's progress view expects"""
+    remaining = [agent for agent in PROGRESS_STEPS if agent not in agents_completed]
+    return {
+        "startup_id": startup_id,
+        "progress": int(100 * len(agents_completed) / len(PROGRESS_STEPS)),
+        "status": status,
+        "current_agent": remaining[0] if remaining else None,
+        "agents_completed": list(agents_completed),
+        "updated_at": time.time()
+    }
+
+async def _process_pitch_materials(uploaded_files: List[Dict[str, Any]], startup_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Multi-modal analysis of the uploaded pitch materials, with its deal memo attached"""
+    multi_modal_analysis = await get_multimodal_processor().process_pitch_materials(
+        uploaded_files,
+        startup_info
+    )
+    
+    # Generate structured deal memo
+    deal_memo = await get_deal_memo_generator().generate_investment_memo(
+        multi_modal_analysis,
+        startup_info
+    )
+    
+    multi_modal_analysis["deal_memo"] = deal_memo
+    return multi_modal_analysis
+
+async def _no_pitch_materials() -> None:
+    return None
+
 @app.post("/api/analyze")
-async def analyze_startup_enhanced(startup_input: StartupInput):
-    """Enhanced startup analysis using Google Tech Stack with multi-modal processing"""
-    startup_id = f"{startup_input.company_name.replace(' ', '_')}_{int(time.time())}"
+async def analyze_startup_enhanced(startup_input: StartupInput, startup_id: Optional[str] = None):
+    """Enhanced startup analysis using Google Tech Stack with multi-modal processing
+    
+    Clients that want live progress pass their own unguessable startup_id
+    (e.g. a UUID) and open /api/analysis-progress-stream/{startup_id} before
+    posting; an id another analysis already uses is rejected.
+    """
+    progress = app.state.progress
+    if startup_id is None:
+        # Random ids cannot collide when the same company is analysed twice in a second
+        startup_id = secrets.token_urlsafe(12)
+    elif not progress.valid_id(startup_id):
+        raise HTTPException(status_code=400, detail="startup_id must be 16-64 URL-safe characters")
+    if not progress.claim(startup_id):
+        raise HTTPException(status_code=409, detail="startup_id is already in use")
+    agents_completed = []
+    
+    def on_agent_complete(agent_key: str, result):
+        agents_completed.append(agent_key)
+        progress.publish(startup_id, _progress_event(startup_id, agents_completed, "in_progress"))
+    
+    progress.publish(startup_id, _progress_event(startup_id, agents_completed, "initiated"))
     
     try:
         logger.info(f"Starting enhanced multi-modal analysis for {startup_input.company_name}")
         
+        # Dumped once and shared by the agents and the pitch-material processors
+        startup_payload = startup_input.model_dump(mode="json")
+        
         # Step 1: Check for uploaded files for multi-modal processing
         uploaded_files = getattr(startup_input, 'uploaded_files', [])
         
-        multi_modal_analysis = None
         if uploaded_files and len(uploaded_files) > 0:
             logger.info(f"Processing {len(uploaded_files)} uploaded files")
-            
-            # Process multi-modal pitch materials
-            multi_modal_analysis = await multimodal_processor.process_pitch_materials(
-                uploaded_files,
-                startup_input.dict()
-            )
-            
-            # Generate structured deal memo
-            deal_memo = await deal_memo_generator.generate_investment_memo(
-                multi_modal_analysis,
-                startup_input.dict()
-            )
-            
-            multi_modal_analysis["deal_memo"] = deal_memo
         
-        # Step 2: Use working orchestrator for comprehensive analysis
-        results = google_adk_orchestrator.analyze_startup(startup_input, "demo_user")
+        # Step 2: Use working orchestrator for comprehensive analysis; the
+        # agents are awaited on the event loop so other requests keep flowing
+        from agents.startup_analyst_agents import StartupData
+        startup_data = StartupData.from_input(startup_payload)
+        
+        # The pitch materials and the agent analysis are independent, so run
+        # them side by side instead of one after the other
+        multi_modal_analysis, results = await asyncio.gather(
+            _process_pitch_materials(uploaded_files, startup_payload) if uploaded_files else _no_pitch_materials(),
+            get_orchestrator().aanalyze_startup(startup_data, on_agent_complete)
+        )
         
         # Step 3: Enhance results with multi-modal analysis if available
         if multi_modal_analysis:
@@ -204,15 +364,33 @@ async def analyze_startup_enhanced(startup_input: StartupInput):
         else:
             results["has_pitch_materials"] = False
         
-        return {
-            "status": "success",
-            "startup_id": startup_id,
-            "results": results,
-            "message": "Multi-modal analysis completed using Google Tech Stack"
-        }
+        # orjson serializes the AnalysisResult dataclasses natively, so skip
+        # FastAPI's jsonable_encoder pass over the whole findings tree; the
+        # findings are encoded once and shared by the stream and the response
+        results_json = orjson.Fragment(
+            orjson.dumps(results, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str)
+        )
+        
+        completed = _progress_event(startup_id, list(PROGRESS_STEPS), "completed")
+        completed["results"] = results_json
+        progress.publish(startup_id, completed)
+        
+        return Response(
+            content=orjson.dumps({
+                "status": "success",
+                "startup_id": startup_id,
+                "company_name": startup_input.company_name,
+                "results": results_json,
+                "message": "Multi-modal analysis completed using Google Tech Stack"
+            }),
+            media_type="application/json"
+        )
         
     except Exception as e:
         logger.error(f"Enhanced analysis failed: {str(e)}")
+        failed = _progress_event(startup_id, agents_completed, "failed")
+        failed["error"] = str(e)
+        progress.publish(startup_id, failed)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @app.post("/api/upload-file")
@@ -222,7 +400,7 @@ async def upload_file(
 ):
     """Upload file to Google Cloud Storage"""
     try:
-        if not enhanced_storage_client.is_available():
+        if not get_storage_client().is_available():
             # Demo mode response
             return {
                 "status": "success",
@@ -233,23 +411,15 @@ async def upload_file(
                 "message": "Demo mode: File would be uploaded to Google Cloud Storage"
             }
         
-        # Read file data
-        file_data = await file.read()
-        
-        # Upload to Google Cloud Storage
-        if startup_id:
-            result = enhanced_storage_client.upload_startup_file(
-                file_data, 
-                file.filename or "unknown", 
-                startup_id,
-                file.content_type
-            )
-        else:
-            result = enhanced_storage_client.upload_demo_file(
-                file_data,
-                file.filename or "unknown",
-                "document"
-            )
+        # Stream the spooled upload to Google Cloud Storage in chunks, off the event loop
+        result = await asyncio.to_thread(
+            get_storage_client().upload_stream,
+            file.file,
+            file.filename or "unknown",
+            startup_id=startup_id,
+            content_type=file.content_type if startup_id else None,
+            size_hint=file.size
+        )
         
         return {
             "status": "success",
@@ -264,12 +434,26 @@ async def upload_file(
         logger.error(f"File upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
 
+@app.get("/api/analysis-progress-stream/{startup_id}")
+async def stream_analysis_progress(startup_id: str):
+    """Push analysis progress as Server-Sent Events until the analysis finishes
+    
+    A stream that connects late or reconnects starts from the latest event.
+    """
+    if not app.state.progress.valid_id(startup_id):
+        raise HTTPException(status_code=400, detail="startup_id must be 16-64 URL-safe characters")
+    return StreamingResponse(
+        app.state.progress.stream(startup_id, PROGRESS_HEARTBEAT_SECONDS, PROGRESS_STREAM_TIMEOUT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/analysis-progress/{startup_id}")
 async def get_analysis_progress(startup_id: str):
-    """Get real-time analysis progress"""
+    """Get analysis progress by polling (kept for older clients; prefer the SSE stream)"""
     try:
-        if enhanced_firebase_client.is_available():
-            session_data = enhanced_firebase_client.get_analysis_session(startup_id)
+        if get_firebase_client().is_available():
+            session_data = await asyncio.to_thread(get_firebase_client().get_analysis_session, startup_id)
             if session_data:
                 return session_data
         
@@ -289,12 +473,13 @@ async def get_analysis_progress(startup_id: str):
         raise HTTPException(status_code=500, detail=f"Progress tracking failed: {str(e)}")
 
 @app.get("/api/analysis-history/{user_id}")
-async def get_analysis_history(user_id: str):
+async def get_analysis_history(user_id: str, request: Request):
     """Get user's analysis history"""
     try:
-        if enhanced_firebase_client.is_available():
-            history = enhanced_firebase_client.get_user_analysis_history(user_id)
-            return {"history": history}
+        if get_firebase_client().is_available():
+            history = await asyncio.to_thread(get_firebase_client().get_user_analysis_history, user_id)
+            body = orjson.dumps({"history": history}, default=str)
+            return _etag_response(request, body, _etag(body))
         
         # Demo mode response
         return {
@@ -324,51 +509,33 @@ async def get_analysis_history(user_id: str):
         raise HTTPException(status_code=500, detail=f"History retrieval failed: {str(e)}")
 
 @app.get("/api/demo-scenarios")
-async def get_demo_scenarios():
+async def get_demo_scenarios(request: Request):
     """Get demo scenarios for testing"""
-    try:
-        scenarios = enhanced_firebase_client.get_demo_scenarios()
-        return {"scenarios": scenarios}
+    global _demo_scenarios_cache
+    body, etag, expires_at = _demo_scenarios_cache
+    if body is None or time.monotonic() >= expires_at:
+        try:
+            scenarios = await asyncio.to_thread(get_firebase_client().get_demo_scenarios)
+        except Exception as e:
+            logger.error(f"Failed to get demo scenarios: {str(e)}")
+            # Return default scenarios
+            scenarios = DEFAULT_DEMO_SCENARIOS
         
-    except Exception as e:
-        logger.error(f"Failed to get demo scenarios: {str(e)}")
-        # Return default scenarios
-        return {
-            "scenarios": [
-                {
-                    "company_name": "MedAI Solutions",
-                    "industry": "Healthcare Technology",
-                    "stage": "Series A",
-                    "description": "AI-powered diagnostic platform for radiology",
-                    "funding_request": "$5M",
-                    "key_metrics": "200+ hospitals using platform, 95% accuracy rate"
-                },
-                {
-                    "company_name": "EcoTransport",
-                    "industry": "Clean Technology", 
-                    "stage": "Seed",
-                    "description": "Electric vehicle charging network with renewable energy",
-                    "funding_request": "$2.5M",
-                    "key_metrics": "50 charging stations deployed, partnerships with 3 cities"
-                },
-                {
-                    "company_name": "FinanceFlow",
-                    "industry": "Financial Technology",
-                    "stage": "Series B", 
-                    "description": "Automated financial planning for small businesses",
-                    "funding_request": "$15M",
-                    "key_metrics": "10,000+ SMB customers, $500K monthly recurring revenue"
-                }
-            ]
-        }
+        # Serialize once per refresh; every request in between sends the same bytes
+        body = orjson.dumps({"scenarios": scenarios}, default=str)
+        etag = _etag(body)
+        _demo_scenarios_cache = (body, etag, time.monotonic() + DEMO_SCENARIOS_TTL_SECONDS)
+    
+    return _etag_response(request, body, etag, f"public, max-age={DEMO_SCENARIOS_TTL_SECONDS}")
 
 @app.get("/api/storage-stats")
-async def get_storage_stats():
+async def get_storage_stats(request: Request):
     """Get Google Cloud Storage statistics"""
     try:
-        if enhanced_storage_client.is_available():
-            stats = enhanced_storage_client.get_storage_stats()
-            return stats
+        if get_storage_client().is_available():
+            stats = await asyncio.to_thread(get_storage_client().get_storage_stats)
+            body = orjson.dumps(stats, default=str)
+            return _etag_response(request, body, _etag(body))
         
         return {
             "message": "Storage not available in demo mode",
@@ -387,8 +554,8 @@ async def get_storage_stats():
 async def list_startup_files(startup_id: str):
     """List files for a specific startup"""
     try:
-        if enhanced_storage_client.is_available():
-            files = enhanced_storage_client.list_startup_files(startup_id)
+        if get_storage_client().is_available():
+            files = await asyncio.to_thread(get_storage_client().list_startup_files, startup_id)
             return {"files": files}
         
         return {
@@ -410,7 +577,7 @@ async def generate_deal_memo(request_data: dict):
         logger.info(f"Generating deal memo for {startup_info.get('company_name', 'Unknown')}")
         
         # Generate deal memo using the specialized generator
-        deal_memo = await deal_memo_generator.generate_investment_memo(
+        deal_memo = await get_deal_memo_generator().generate_investment_memo(
             analysis_results,
             startup_info
         )
@@ -436,7 +603,7 @@ async def process_multimodal_files(request_data: dict):
         logger.info(f"Processing {len(files)} multi-modal files")
         
         # Process multi-modal content
-        analysis_results = await multimodal_processor.process_pitch_materials(
+        analysis_results = await get_multimodal_processor().process_pitch_materials(
             files,
             startup_info
         )
@@ -457,20 +624,45 @@ async def process_multimodal_files(request_data: dict):
         logger.error(f"Multi-modal processing failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Multi-modal processing failed: {str(e)}")
 
-# Serve React app for all other routes
-@app.get("/{full_path:path}")
-async def serve_react_app(full_path: str):
-    """Serve React application"""
-    if os.path.exists("frontend/build/index.html"):
-        return FileResponse("frontend/build/index.html")
-    else:
-        return {"message": "React frontend not built. Run 'npm run build' in frontend directory."}
+# Serve the React app (favicon, manifest, logos, client-side routes) for all
+# other paths; mounted last so every API route above takes precedence
+if FRONTEND_BUILT:
+    app.mount(
+        "/",
+        SPAStaticFiles(directory="frontend/build", html=True, cache_control="public, max-age=3600"),
+        name="spa"
+    )
+
+@app.exception_handler(404)
+async def not_found(request: Request, exc: StarletteHTTPException):
+    """JSON 404s for the API; without a build, explain how to get the frontend"""
+    if request.url.path.startswith("/api/") or FRONTEND_BUILT:
+        return ORJSONResponse({"detail": exc.detail}, status_code=404)
+    return ORJSONResponse(
+        {"message": "React frontend not built. Run 'npm run build' in frontend directory."},
+        status_code=404
+    )
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "enhanced_main:app",
-        host="0.0.0.0",
-        port=8080,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    if os.getenv("DEV"):
+        # Auto-reload is single-process; keep it for local development only
+        uvicorn.run(
+            "enhanced_main:app",
+            host="0.0.0.0",
+            port=8080,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # Progress streams live in process memory, so an SSE client must reach
+        # the worker running its analysis; default to one worker unless
+        # WEB_CONCURRENCY says otherwise
+        uvicorn.run(
+            "enhanced_main:app",
+            host="0.0.0.0",
+            port=8080,
+            workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
\ No newline at end of file
@@ -1,18 +1,21 @@
 """
 FastAPI backend for Startup Analyst Platform
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 import uvicorn
 import asyncio
+import hashlib
+import orjson
+import os
 import time
 from typing import Dict, Any
 import logging
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
-from src.agents.vertex_ai_orchestrator import VertexAIOrchestrator
 from src.models.startup import StartupInput, AnalysisResults
 from src.config.settings import settings
 
@@ -20,51 +23,160 @@ from src.config.settings import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global orchestrator instance
-orchestrator = None
+@lru_cache(maxsize=1)
+def get_orchestrator():
+    """Shared orchestrator, imported and built on first use rather than at startup"""
+    from src.agents.vertex_ai_orchestrator import VertexAIOrchestrator
+    return VertexAIOrchestrator()
+
+def orchestrator_ready() -> bool:
+    return get_orchestrator.cache_info().currsize > 0
+
+# get_agent_status sends a test prompt to every agent, so its result is
+# reused for a while instead of being recomputed on each status request
+AGENT_STATUS_TTL_SECONDS = 300
+_agent_status_cache = (None, 0.0)
+_agent_status_lock = asyncio.Lock()
+
+async def cached_agent_status() -> Dict[str, Any]:
+    """Agent status, refreshed at most once per AGENT_STATUS_TTL_SECONDS"""
+    global _agent_status_cache
+    async with _agent_status_lock:
+        status, expires_at = _agent_status_cache
+        if status is None or time.monotonic() >= expires_at:
+            # The probe makes blocking model calls; keep them off the event loop
+            status = await asyncio.to_thread(get_orchestrator().get_agent_status)
+            _agent_status_cache = (status, time.monotonic() + AGENT_STATUS_TTL_SECONDS)
+        return status
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global orchestrator
-    
     # Startup
     logger.info("Starting Enhanced Startup Analyst Platform with Vertex AI...")
-    orchestrator = VertexAIOrchestrator()
+    if os.getenv("DEV"):
+        # Log any callback that holds the event loop for more than 100 ms;
+        # asyncio only checks this in debug mode
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.1
     
-    # Start keep-alive task
-    keep_alive_task = asyncio.create_task(keep_alive_worker())
+    # Build the orchestrator in the background so health probes answer at once
+    app.state.warm_up = asyncio.create_task(asyncio.to_thread(get_orchestrator))
     
     yield
     
     # Shutdown
     logger.info("Shutting down Startup Analyst Platform...")
-    keep_alive_task.cancel()
 
 # Create FastAPI app
 app = FastAPI(
     title="Startup Analyst Platform",
     description="AI-Powered Startup Investment Analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson renders the large nested analysis findings several times faster
+    default_response_class=ORJSONResponse
 )
 
+# The build does not change while the process runs, so check for it once
+FRONTEND_BUILT = os.path.exists("frontend/build")
+SPA_INDEX = "frontend/build/index.html" if os.path.exists("frontend/build/index.html") else None
+FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN")
+
 # Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your frontend domain
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# The built React app is served from this same origin and needs no CORS; only
+# a separately hosted frontend (dev server or FRONTEND_ORIGIN) does
+if FRONTEND_ORIGIN or not FRONTEND_BUILT:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=(FRONTEND_ORIGIN or "http://localhost:3001,http://localhost:3000").split(","),
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["Content-Type", "Authorization"],
+        # Let browsers cache the preflight for a day
+        max_age=86400,
+    )
 
 # Mount static files (React build)
-app.mount("/static", StaticFiles(directory="frontend/build/static"), name="static")
+if os.path.exists("frontend/build/static"):
+    app.mount("/static", StaticFiles(directory="frontend/build/static"), name="static")
+
+# Static demo scenarios, serialized once at import
+DEMO_SCENARIOS = [
+    {
+        "id": "high-potential",
+        "name": "High-Potential AI Startup",
+        "description": "AI-powered healthcare platform with strong team and market opportunity",
+        "data": {
+            "company_name": "MedAI Solutions",
+            "business_description": "AI-powered diagnostic platform that helps doctors identify diseases from medical images with 95% accuracy. Our platform reduces diagnosis time by 70% and improves patient outcomes.",
+            "industry": "Healthcare AI",
+            "stage": "Series A",
+            "founder_name": "Dr. Sarah Chen",
+            "founder_background": "Former Google AI researcher with 10 years in medical imaging. PhD in Computer Science from Stanford. Published 50+ papers in top-tier journals.",
+            "website": "https://medai-solutions.com",
+            "additional_info": "Raised $5M seed round. 50+ hospital partnerships. FDA approval in progress."
+        }
+    },
+    {
+        "id": "risky-startup",
+        "name": "Risky Consumer App",
+        "description": "Consumer app with unclear business model and high competition",
+        "data": {
+            "company_name": "SocialSnap",
+            "business_description": "Social media app for sharing photos with friends. Features include filters, stories, and group chats. Targeting Gen Z users.",
+            "industry": "Social Media",
+            "stage": "Seed",
+            "founder_name": "Mike Johnson",
+            "founder_background": "Recent college graduate with 2 years at a startup. No previous experience in social media or consumer apps.",
+            "website": "https://socialsnap.app",
+            "additional_info": "Pre-revenue. High user acquisition costs. Competing with Instagram and TikTok."
+        }
+    },
+    {
+        "id": "watch-list",
+        "name": "Watch List B2B SaaS",
+        "description": "Early-stage B2B SaaS with promising technology but needs more traction",
+        "data": {
+            "company_name": "WorkflowAI",
+            "business_description": "AI-powered workflow automation platform for small businesses. Automates repetitive tasks and improves productivity by 40%.",
+            "industry": "B2B SaaS",
+            "stage": "Seed",
+            "founder_name": "Alex Rodriguez",
+            "founder_background": "Former Salesforce engineer with 8 years experience. MBA from Wharton. Previous startup experience.",
+            "website": "https://workflowai.com",
+            "additional_info": "Early traction with 100+ customers. $50K MRR. Strong product-market fit signals."
+        }
+    }
+]
+DEMO_SCENARIOS_JSON = orjson.dumps({"scenarios": DEMO_SCENARIOS})
+
+# Data that changes on human time-scales is revalidated with an ETag so
+# repeat fetches get an empty 304 instead of the full body
+REVALIDATE_CACHE_CONTROL = "private, max-age=60, must-revalidate"
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+def _etag_response(request: Request, body: bytes, etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    """JSON body with validators, or 304 Not Modified when the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag in request.headers.get("if-none-match", "").split(", "):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+DEMO_SCENARIOS_ETAG = _etag(DEMO_SCENARIOS_JSON)
 
 @app.get("/")
 async def serve_frontend():
     """Serve the React frontend"""
-    return FileResponse("frontend/build/index.html")
+    if SPA_INDEX is None:
+        return ORJSONResponse(
+            {"message": "React frontend not built. Run 'npm run build' in frontend directory."},
+            status_code=503
+        )
+    return FileResponse(SPA_INDEX)
 
 @app.get("/api/health")
 async def health_check():
@@ -78,10 +190,10 @@ async def health_check():
 @app.get("/api/status")
 async def get_status():
     """Get system status"""
-    if orchestrator:
+    if orchestrator_ready():
         return {
             "status": "ready",
-            "agents": orchestrator.get_agent_status(),
+            "agents": await cached_agent_status(),
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         }
     return {"status": "initializing"}
@@ -90,32 +202,19 @@ async def get_status():
 async def analyze_startup(startup_input: StartupInput, background_tasks: BackgroundTasks, user_id: str = None):
     """Analyze a startup using enhanced Vertex AI agents"""
     try:
-        if not orchestrator:
+        if not orchestrator_ready():
             raise HTTPException(status_code=503, detail="System not ready")
         
         logger.info(f"Starting enhanced analysis for {startup_input.company_name}")
         
         # Convert StartupInput to StartupData format
         from agents.startup_analyst_agents import StartupData
-        startup_data = StartupData(
-            company_name=startup_input.company_name,
-            founder_name=startup_input.founder_name or "Unknown",
-            business_description=startup_input.business_description,
-            pitch_deck_url=startup_input.pitch_deck_url,
-            website_url=startup_input.website,
-            industry=startup_input.industry,
-            funding_stage=startup_input.stage,
-            team_size=None
-        )
+        startup_data = StartupData.from_input(startup_input.model_dump(include=StartupData.INPUT_FIELDS))
         
-        # Run enhanced analysis with Vertex AI
+        # Run enhanced analysis with Vertex AI; the orchestrator is async, so
+        # awaiting it leaves the event loop free for other requests
         try:
-            results = orchestrator.analyze_startup(startup_data)
-            # Check if results is a coroutine (async function)
-            if hasattr(results, '__await__'):
-                # If it's async, we need to await it
-                import asyncio
-                results = await results
+            results = await get_orchestrator().analyze_startup(startup_data)
         except Exception as e:
             logger.error(f"Analysis error: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -150,7 +249,7 @@ async def analyze_startup(startup_input: StartupInput, background_tasks: Backgro
 async def get_analysis_progress(startup_id: str):
     """Get real-time analysis progress"""
     try:
-        if not orchestrator:
+        if not orchestrator_ready():
             raise HTTPException(status_code=503, detail="System not ready")
         
         # Simple progress response since working orchestrator doesn't track progress
@@ -178,105 +277,56 @@ async def get_analysis_progress(startup_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to get analysis progress: {str(e)}")
 
 @app.get("/api/analysis-history/{user_id}")
-async def get_analysis_history(user_id: str):
+async def get_analysis_history(user_id: str, request: Request):
     """Get analysis history for a user"""
     try:
-        if not orchestrator:
+        if not orchestrator_ready():
             raise HTTPException(status_code=503, detail="System not ready")
         
-        history = orchestrator.firebase_client.get_analysis_history(user_id)
+        history = await asyncio.to_thread(get_orchestrator().firebase_client.get_analysis_history, user_id)
         
-        return {
+        # The validator covers the history only; the response timestamp changes every second
+        etag = _etag(orjson.dumps(history, default=str))
+        if etag in request.headers.get("if-none-match", "").split(", "):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL})
+        
+        return ORJSONResponse({
             "status": "success",
             "history": history,
             "count": len(history),
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
+        }, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL})
         
     except Exception as e:
         logger.error(f"Failed to get analysis history: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get analysis history: {str(e)}")
 
 @app.get("/api/demo-scenarios")
-async def get_demo_scenarios():
+async def get_demo_scenarios(request: Request):
     """Get demo scenarios for testing"""
-    return {
-        "scenarios": [
-            {
-                "id": "high-potential",
-                "name": "High-Potential AI Startup",
-                "description": "AI-powered healthcare platform with strong team and market opportunity",
-                "data": {
-                    "company_name": "MedAI Solutions",
-                    "business_description": "AI-powered diagnostic platform that helps doctors identify diseases from medical images with 95% accuracy. Our platform reduces diagnosis time by 70% and improves patient outcomes.",
-                    "industry": "Healthcare AI",
-                    "stage": "Series A",
-                    "founder_name": "Dr. Sarah Chen",
-                    "founder_background": "Former Google AI researcher with 10 years in medical imaging. PhD in Computer Science from Stanford. Published 50+ papers in top-tier journals.",
-                    "website": "https://medai-solutions.com",
-                    "additional_info": "Raised $5M seed round. 50+ hospital partnerships. FDA approval in progress."
-                }
-            },
-            {
-                "id": "risky-startup",
-                "name": "Risky Consumer App",
-                "description": "Consumer app with unclear business model and high competition",
-                "data": {
-                    "company_name": "SocialSnap",
-                    "business_description": "Social media app for sharing photos with friends. Features include filters, stories, and group chats. Targeting Gen Z users.",
-                    "industry": "Social Media",
-                    "stage": "Seed",
-                    "founder_name": "Mike Johnson",
-                    "founder_background": "Recent college graduate with 2 years at a startup. No previous experience in social media or consumer apps.",
-                    "website": "https://socialsnap.app",
-                    "additional_info": "Pre-revenue. High user acquisition costs. Competing with Instagram and TikTok."
-                }
-            },
-            {
-                "id": "watch-list",
-                "name": "Watch List B2B SaaS",
-                "description": "Early-stage B2B SaaS with promising technology but needs more traction",
-                "data": {
-                    "company_name": "WorkflowAI",
-                    "business_description": "AI-powered workflow automation platform for small businesses. Automates repetitive tasks and improves productivity by 40%.",
-                    "industry": "B2B SaaS",
-                    "stage": "Seed",
-                    "founder_name": "Alex Rodriguez",
-                    "founder_background": "Former Salesforce engineer with 8 years experience. MBA from Wharton. Previous startup experience.",
-                    "website": "https://workflowai.com",
-                    "additional_info": "Early traction with 100+ customers. $50K MRR. Strong product-market fit signals."
-                }
-            }
-        ]
-    }
+    return _etag_response(request, DEMO_SCENARIOS_JSON, DEMO_SCENARIOS_ETAG, "public, max-age=3600")
 
 async def log_analysis_completion(company_name: str, processing_time: float):
     """Log analysis completion"""
     logger.info(f"Analysis completed for {company_name} in {processing_time:.2f} seconds")
 
-async def keep_alive_worker():
-    """Keep the service alive to prevent Cloud Run sleep"""
-    while True:
-        try:
-            # Make a request to our own health endpoint
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.get("http://localhost:8080/api/health")
-                if response.status_code == 200:
-                    logger.info("Keep-alive ping successful")
-                else:
-                    logger.warning(f"Keep-alive ping failed: {response.status_code}")
-        except Exception as e:
-            logger.error(f"Keep-alive ping error: {str(e)}")
-        
-        # Wait 10 minutes before next ping
-        await asyncio.sleep(600)
-
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8080,
-        reload=True,
-        log_level="info"
-    )
+    if os.getenv("DEV"):
+        # Auto-reload is single-process; keep it for local development only
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8080,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8080,
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
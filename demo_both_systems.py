@@ -95,7 +95,8 @@ async def demo_vertex_ai_agents():
         }
         
         start_time = time.time()
-        result = orchestrator.agents["data_collection"].analyze(test_data)
+        # analyze() blocks; keep the loop free for the traditional demo running alongside
+        result = await asyncio.to_thread(orchestrator.agents["data_collection"].analyze, test_data)
         end_time = time.time()
         
         print(f"⏱️ Response time: {end_time - start_time:.2f} seconds")
@@ -189,11 +190,12 @@ async def main():
     print("🎯 Demonstrating both Traditional and Vertex AI Agent Builder systems")
     
     try:
-        # Demo traditional agents
-        traditional_success = demo_traditional_agents()
-        
-        # Demo Vertex AI agents
-        vertex_success = await demo_vertex_ai_agents()
+        # Both demos wait on model round-trips, so run them side by side;
+        # the traditional demo is synchronous and gets its own thread
+        traditional_success, vertex_success = await asyncio.gather(
+            asyncio.to_thread(demo_traditional_agents),
+            demo_vertex_ai_agents()
+        )
         
         # Compare systems
         compare_systems()
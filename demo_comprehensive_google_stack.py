@@ -4,8 +4,12 @@ Comprehensive Google Tech Stack Demonstration
 Shows all implemented Google services working together
 """
 import os
+import io
 import sys
 import asyncio
+import contextlib
+import contextvars
+import mmap
 import time
 from pathlib import Path
 
@@ -20,11 +24,64 @@ from src.utils.enhanced_firebase_client import enhanced_firebase_client
 from src.utils.enhanced_storage_client import enhanced_storage_client
 from src.agents.google_adk_orchestrator import google_adk_orchestrator
 
+# Status markers, looked up by whether a service or agent is up
+_SERVICE_ICONS = {True: '✅', False: '⚠️'}
+_SERVICE_STATES = {True: 'Available', False: 'Not available (development mode)'}
+_AGENT_ICONS = {True: '✅', False: '❌'}
+
+# Demo startup for the ADK analysis
+DEMO_STARTUP = {
+    "company_name": "EcoTransport Solutions",
+    "industry": "Clean Technology",
+    "stage": "Series A",
+    "description": "Electric vehicle charging network powered by renewable energy sources",
+    "funding_request": "$8M",
+    "key_metrics": "75 charging stations deployed, partnerships with 5 cities, 2,000 active users",
+    "financial_data": {
+        "current_revenue": "$150K monthly",
+        "growth_rate": "40% month-over-month",
+        "customer_acquisition_cost": "$50",
+        "lifetime_value": "$2,500"
+    }
+}
+
+# Banner lines are fixed, so they are built once here
+_BAR = "🚀" + "=" * 68 + "🚀"
+_HEADER_LINE = "🎯 COMPREHENSIVE GOOGLE TECH STACK DEMONSTRATION 🎯".center(70)
+_FOOTER_LINE = "🎉 GOOGLE TECH STACK DEMONSTRATION COMPLETE! 🎉".center(70)
+
+# Buffer for the demo running in the current task; None outside the concurrent demos
+_demo_output = contextvars.ContextVar("demo_output", default=None)
+
+class _TaskStdout:
+    """sys.stdout stand-in that sends each demo's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        return (_demo_output.get() or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+
+async def _run_buffered(demo) -> str:
+    """Await a demo coroutine and return what it printed; a failure is reported in its output"""
+    buffer = io.StringIO()
+    # gather runs this in its own task, and to_thread copies the context, so only this demo writes here
+    _demo_output.set(buffer)
+    try:
+        await demo
+    except Exception as e:
+        print(f"❌ Demo failed: {str(e)}")
+        print()
+    return buffer.getvalue()
+
 def display_header():
     """Display demo header"""
-    print("🚀" + "=" * 68 + "🚀")
-    print("🎯 COMPREHENSIVE GOOGLE TECH STACK DEMONSTRATION 🎯".center(70))
-    print("🚀" + "=" * 68 + "🚀")
+    print(_BAR)
+    print(_HEADER_LINE)
+    print(_BAR)
     print()
 
 def check_google_services():
@@ -41,20 +98,21 @@ def check_google_services():
     
     # Check Firebase
     firebase_status = enhanced_firebase_client.is_available()
-    print(f"{'✅' if firebase_status else '⚠️'} Firebase: {'Available' if firebase_status else 'Not available (development mode)'}")
+    print(f"{_SERVICE_ICONS[firebase_status]} Firebase: {_SERVICE_STATES[firebase_status]}")
     
     # Check Cloud Storage
     storage_status = enhanced_storage_client.is_available()
-    print(f"{'✅' if storage_status else '⚠️'} Cloud Storage: {'Available' if storage_status else 'Not available (development mode)'}")
+    print(f"{_SERVICE_ICONS[storage_status]} Cloud Storage: {_SERVICE_STATES[storage_status]}")
     
     # Check Google ADK
     adk_status = google_adk_orchestrator.get_agent_status()
-    print(f"{'✅' if adk_status['orchestrator_initialized'] else '❌'} Google ADK: {adk_status['total_agents']} agents initialized")
+    print(f"{_AGENT_ICONS[adk_status['orchestrator_initialized']]} Google ADK: {adk_status['total_agents']} agents initialized")
     
     if adk_status['orchestrator_initialized']:
-        for agent_type, details in adk_status['agent_details'].items():
-            status_icon = '✅' if details['initialized'] else '❌'
-            print(f"  {status_icon} {agent_type.replace('_', ' ').title()}: {details['model_type']}")
+        print("\n".join(
+            f"  {_AGENT_ICONS[details['initialized']]} {agent_type.replace('_', ' ').title()}: {details['model_type']}"
+            for agent_type, details in adk_status['agent_details'].items()
+        ))
     
     print()
     return {
@@ -64,7 +122,7 @@ def check_google_services():
         'adk': adk_status['orchestrator_initialized']
     }
 
-def demo_firebase_realtime():
+async def demo_firebase_realtime():
     """Demonstrate Firebase real-time capabilities"""
     print("🔥 FIREBASE REAL-TIME COLLABORATION DEMO")
     print("-" * 50)
@@ -78,7 +136,7 @@ def demo_firebase_realtime():
     test_id = f"demo_session_{int(time.time())}"
     
     print(f"📊 Creating analysis session: {test_id}")
-    success = enhanced_firebase_client.create_analysis_session(test_id, "demo_user")
+    success = await asyncio.to_thread(enhanced_firebase_client.create_analysis_session, test_id, "demo_user")
     print(f"{'✅' if success else '❌'} Session created: {success}")
     
     # Test progress updates
@@ -90,22 +148,34 @@ def demo_firebase_realtime():
         ("Report Generation", 100)
     ]
     
+    # All five updates go out as one batched write instead of five round-trips
     print(f"🔄 Simulating real-time progress updates:")
+    success = await asyncio.to_thread(
+        enhanced_firebase_client.update_real_time_progress_batch,
+        test_id,
+        [(agent, progress, {"status": f"{agent.lower()} completed"}) for agent, progress in progress_steps]
+    )
     for agent, progress in progress_steps:
-        success = enhanced_firebase_client.update_real_time_progress(
-            test_id, agent, progress, {"status": f"{agent.lower()} completed"}
-        )
         print(f"  {'✅' if success else '❌'} {agent}: {progress}%")
-        time.sleep(0.3)
     
     # Test session retrieval
-    session_data = enhanced_firebase_client.get_analysis_session(test_id)
+    session_data = await asyncio.to_thread(enhanced_firebase_client.get_analysis_session, test_id)
     if session_data:
         print(f"✅ Session data retrieved - Progress: {session_data.get('progress', 0)}%")
     
     print()
 
-def demo_cloud_storage():
+DEMO_BUSINESS_PLAN_PATH = Path(__file__).parent / "assets" / "demo_business_plan.txt"
+
+def _upload_demo_business_plan():
+    """Upload the demo business plan straight from a read-only mapping of the file"""
+    with open(DEMO_BUSINESS_PLAN_PATH, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # The mapping is file-like, so the upload reads the pages without a bytes copy
+        return enhanced_storage_client.upload_stream(
+            mm, "techflow_ai_business_plan.txt", file_type="business_plan", size_hint=len(mm)
+        )
+
+async def demo_cloud_storage():
     """Demonstrate Google Cloud Storage capabilities"""
     print("☁️ GOOGLE CLOUD STORAGE DEMO")
     print("-" * 50)
@@ -116,71 +186,13 @@ def demo_cloud_storage():
         print("✅ Demonstrates professional file handling architecture")
         return
     
-    # Demo file content
-    demo_content = b"""EXECUTIVE SUMMARY - TechFlow AI
-
-COMPANY OVERVIEW:
-- Name: TechFlow AI
-- Industry: Artificial Intelligence
-- Stage: Series A
-- Funding Request: $5M
-
-PROBLEM STATEMENT:
-Small businesses struggle with data analysis and decision-making due to lack of technical expertise and expensive enterprise solutions.
-
-SOLUTION:
-AI-powered analytics platform that provides instant insights and recommendations through an intuitive interface.
-
-MARKET OPPORTUNITY:
-- Total Addressable Market: $50B
-- Serviceable Addressable Market: $10B
-- Target: SMBs with 10-500 employees
-
-BUSINESS MODEL:
-- SaaS subscriptions: $99-$999/month
-- Professional services: $150/hour
-- Enterprise licenses: $10K-$100K/year
-
-FINANCIAL PROJECTIONS:
-Year 1: $500K revenue, 100 customers
-Year 2: $2M revenue, 500 customers
-Year 3: $5M revenue, 1,200 customers
-
-TEAM:
-- CEO: Former Google AI researcher (PhD Stanford)
-- CTO: Ex-Microsoft Azure architect (15 years experience)
-- VP Sales: B2B sales expert (20 years, 3 successful exits)
-
-TRACTION:
-- 50 pilot customers
-- $50K monthly recurring revenue
-- 95% customer satisfaction score
-- 3 strategic partnerships signed
-
-FUNDING USE:
-- 40% Product development and AI model training
-- 30% Sales and marketing expansion
-- 20% Team expansion (10 new hires)
-- 10% Working capital and operations
-
-COMPETITIVE ADVANTAGES:
-- Proprietary AI algorithms
-- Industry-specific templates
-- No-code interface
-- 10x faster implementation than competitors
-
-EXIT STRATEGY:
-- Strategic acquisition by major tech company
-- Target: $100M+ valuation in 3-5 years
-- Potential acquirers: Microsoft, Google, Salesforce
-"""
-    
     try:
         print("📤 Uploading demo business plan...")
-        result = enhanced_storage_client.upload_demo_file(
-            demo_content,
-            "techflow_ai_business_plan.txt",
-            "business_plan"
+        # The listing does not depend on the upload, so both requests go out together;
+        # the statistics describe the bucket as it was before this upload
+        result, stats = await asyncio.gather(
+            asyncio.to_thread(_upload_demo_business_plan),
+            asyncio.to_thread(enhanced_storage_client.get_storage_stats)
         )
         
         if result['success']:
@@ -189,9 +201,8 @@ EXIT STRATEGY:
             print(f"  Public URL: {result['public_url']}")
             print(f"  Storage Path: {result['storage_path']}")
         
-        # Get storage stats
+        # Show storage stats
         print(f"\n📊 Storage Statistics:")
-        stats = enhanced_storage_client.get_storage_stats()
         if 'error' not in stats:
             print(f"  Total Files: {stats.get('total_files', 0)}")
             print(f"  Total Size: {stats.get('total_size_mb', 0)} MB")
@@ -218,35 +229,19 @@ async def demo_google_adk():
         print("✅ Would work with proper Google Cloud credentials")
         return
     
-    # Demo startup for analysis
-    demo_startup = {
-        "company_name": "EcoTransport Solutions",
-        "industry": "Clean Technology",
-        "stage": "Series A",
-        "description": "Electric vehicle charging network powered by renewable energy sources",
-        "funding_request": "$8M",
-        "key_metrics": "75 charging stations deployed, partnerships with 5 cities, 2,000 active users",
-        "financial_data": {
-            "current_revenue": "$150K monthly",
-            "growth_rate": "40% month-over-month",
-            "customer_acquisition_cost": "$50",
-            "lifetime_value": "$2,500"
-        }
-    }
-    
     startup_id = f"adk_demo_{int(time.time())}"
     
-    print(f"\n🚀 Starting comprehensive analysis for: {demo_startup['company_name']}")
-    print(f"Industry: {demo_startup['industry']}")
-    print(f"Stage: {demo_startup['stage']}")
-    print(f"Funding Request: {demo_startup['funding_request']}")
+    print(f"\n🚀 Starting comprehensive analysis for: {DEMO_STARTUP['company_name']}")
+    print(f"Industry: {DEMO_STARTUP['industry']}")
+    print(f"Stage: {DEMO_STARTUP['stage']}")
+    print(f"Funding Request: {DEMO_STARTUP['funding_request']}")
     
     try:
         start_time = time.time()
         
         # Run comprehensive analysis
         results = await google_adk_orchestrator.orchestrate_comprehensive_analysis(
-            demo_startup,
+            DEMO_STARTUP,
             startup_id,
             "demo_user"
         )
@@ -356,25 +351,37 @@ def display_summary():
     print("  • Production deployment architecture")
     
     print()
-    print("🚀" + "=" * 68 + "🚀")
-    print("🎉 GOOGLE TECH STACK DEMONSTRATION COMPLETE! 🎉".center(70))
-    print("🚀" + "=" * 68 + "🚀")
+    print(_BAR)
+    print(_FOOTER_LINE)
+    print(_BAR)
 
 async def main():
     """Main demonstration function"""
     try:
-        display_header()
+        # The static sections print dozens of lines; collect them and write
+        # each block to the terminal at once instead of line by line
+        with contextlib.redirect_stdout(io.StringIO()) as buffer:
+            display_header()
+            
+            # Check all services
+            services_status = check_google_services()
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
         
-        # Check all services
-        services_status = check_google_services()
-        
-        # Run demonstrations
-        demo_firebase_realtime()
-        demo_cloud_storage()
-        await demo_google_adk()
-        demo_integration_showcase()
-        
-        display_summary()
+        # The three demos use independent services, so they run concurrently;
+        # each one's output is buffered and printed in order afterwards
+        with contextlib.redirect_stdout(_TaskStdout(sys.stdout)):
+            outputs = await asyncio.gather(
+                _run_buffered(demo_firebase_realtime()),
+                _run_buffered(demo_cloud_storage()),
+                _run_buffered(demo_google_adk())
+            )
+        with contextlib.redirect_stdout(io.StringIO()) as buffer:
+            demo_integration_showcase()
+            
+            display_summary()
+        sys.stdout.write("".join(outputs) + buffer.getvalue())
+        sys.stdout.flush()
         
     except Exception as e:
         print(f"❌ Demonstration failed: {str(e)}")
@@ -385,14 +392,6 @@ async def main():
     return True
 
 if __name__ == "__main__":
-    # Install python-dotenv if not available
-    try:
-        from dotenv import load_dotenv
-    except ImportError:
-        print("Installing python-dotenv...")
-        os.system("pip3 install python-dotenv")
-        from dotenv import load_dotenv
-    
     # Run the demonstration
     success = asyncio.run(main())
     if not success:
@@ -4,49 +4,163 @@ Live Demo Script - Shows actual Google AI in action
 """
 import os
 import sys
+import asyncio
+import json
 from dotenv import load_dotenv
 import google.generativeai as genai
 import time
+from typing import Optional, Tuple
+
+from agents.llm_cache import enable_for_demo, llm_cache
 
 # Load environment variables
 load_dotenv()
 
-def demo_google_ai_analysis():
+# Re-runs of the demo reuse recent answers instead of calling the model again
+enable_for_demo()
+
+MODEL_NAME = 'gemini-1.5-flash'
+
+# Configured once for the whole run; every prompt goes through this one model,
+# so its client and connection are reused across calls
+API_KEY = os.getenv("GOOGLE_API_KEY")
+if API_KEY:
+    genai.configure(api_key=API_KEY)
+MODEL = genai.GenerativeModel(MODEL_NAME) if API_KEY else None
+
+# Demo startup data
+STARTUP_DATA = {
+    "company_name": "MedAI Solutions",
+    "business_description": "AI-powered diagnostic platform that helps doctors identify diseases from medical images with 95% accuracy. Our platform reduces diagnosis time by 70% and improves patient outcomes.",
+    "industry": "Healthcare AI",
+    "stage": "Series A",
+    "founder_name": "Dr. Sarah Chen",
+    "founder_background": "Former Google AI researcher with 10 years in medical imaging. PhD in Computer Science from Stanford. Published 50+ papers in top-tier journals."
+}
+
+# Comprehensive analysis prompt
+ANALYSIS_PROMPT = f"""
+As an expert startup investment analyst using Google's advanced AI, please analyze this startup:
+
+COMPANY: {STARTUP_DATA['company_name']}
+BUSINESS: {STARTUP_DATA['business_description']}
+INDUSTRY: {STARTUP_DATA['industry']}
+STAGE: {STARTUP_DATA['stage']}
+FOUNDER: {STARTUP_DATA['founder_name']}
+FOUNDER BACKGROUND: {STARTUP_DATA['founder_background']}
+
+Please provide a comprehensive investment analysis including:
+
+1. MARKET ANALYSIS
+   - Market size and opportunity
+   - Growth potential
+   - Competitive landscape
+
+2. BUSINESS MODEL ASSESSMENT
+   - Revenue model viability
+   - Scalability factors
+   - Competitive advantages
+
+3. RISK ASSESSMENT
+   - Market risks
+   - Technology risks
+   - Team risks
+   - Mitigation strategies
+
+4. INVESTMENT RECOMMENDATION
+   - Recommendation: INVEST/PASS/WATCH
+   - Confidence score (1-10)
+   - Key investment thesis
+   - Due diligence priorities
+
+Provide specific, actionable insights for investment decision-making.
+"""
+
+STRUCTURED_PROMPT = """
+Analyze this startup and provide a structured response:
+Company: TechFlow Solutions
+Business: AI-powered workflow automation for small businesses
+
+Risk level is one of LOW/MEDIUM/HIGH, the investment recommendation one of
+INVEST/PASS/WATCH, and the confidence score from 1 to 10.
+"""
+
+# The structured answer comes back as JSON in this shape, so it needs no text parsing
+STRUCTURED_FIELDS = {
+    "market_opportunity": "Market Opportunity",
+    "business_model": "Business Model",
+    "risk_level": "Risk Level",
+    "investment_recommendation": "Investment Recommendation",
+    "confidence_score": "Confidence Score"
+}
+STRUCTURED_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "object",
+        "properties": {
+            **{field: {"type": "string"} for field in STRUCTURED_FIELDS},
+            "confidence_score": {"type": "integer"}
+        },
+        "required": list(STRUCTURED_FIELDS)
+    }
+}
+
+RECOMMENDATION_PROMPT = """
+As a startup investment analyst, provide a clear recommendation for:
+Company: SocialSnap (social media app for Gen Z)
+Business: Photo sharing app competing with Instagram/TikTok
+Stage: Seed stage, pre-revenue
+
+Give a clear INVEST/PASS/WATCH recommendation with reasoning.
+"""
+
+CACHED_NOTE = " (♻️ cached from an earlier run)"
+
+def _cache_key(prompt: str, generation_config: dict = None) -> str:
+    # JSON answers are cached apart from free-text answers to the same prompt
+    agent = "demo_google_ai:json" if generation_config else "demo_google_ai"
+    return llm_cache.cache_key(MODEL_NAME, agent, prompt)
+
+def cached_text(prompt: str, generation_config: dict = None) -> Optional[str]:
+    """Answer from an earlier run, if one was cached within the cache TTL (24h by default)"""
+    return llm_cache.get(_cache_key(prompt, generation_config))
+
+async def generate_text(model, prompt: str, generation_config: dict = None) -> Tuple[str, bool]:
+    """Answer a prompt; the flag is True when the answer was reused from an earlier run"""
+    text = cached_text(prompt, generation_config)
+    if text is not None:
+        return text, True
+    
+    text = (await model.generate_content_async(prompt, generation_config=generation_config)).text
+    llm_cache.set(_cache_key(prompt, generation_config), text)
+    return text, False
+
+async def stream_text(model, prompt: str):
+    """Yield the answer as it streams in, caching it once complete"""
+    response = await model.generate_content_async(prompt, stream=True)
+    parts = []
+    async for chunk in response:
+        parts.append(chunk.text)
+        yield chunk.text
+    llm_cache.set(_cache_key(prompt), "".join(parts))
+
+async def demo_google_ai_analysis(model):
     """Demo actual Google AI analysis for judges"""
     
     print("🚀 STARTUP ANALYST PLATFORM - GOOGLE AI DEMO")
     print("=" * 60)
     
-    # Configure Google AI
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        print("❌ Google API key not found. Please set GOOGLE_API_KEY in .env file")
-        return
-    
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
     print("✅ Connected to Google Generative AI (Gemini)")
-    print("🤖 Using model: gemini-1.5-flash")
+    print(f"🤖 Using model: {MODEL_NAME}")
     print()
     
-    # Demo startup data
-    startup_data = {
-        "company_name": "MedAI Solutions",
-        "business_description": "AI-powered diagnostic platform that helps doctors identify diseases from medical images with 95% accuracy. Our platform reduces diagnosis time by 70% and improves patient outcomes.",
-        "industry": "Healthcare AI",
-        "stage": "Series A",
-        "founder_name": "Dr. Sarah Chen",
-        "founder_background": "Former Google AI researcher with 10 years in medical imaging. PhD in Computer Science from Stanford. Published 50+ papers in top-tier journals."
-    }
-    
     print("📊 ANALYZING STARTUP: MedAI Solutions")
     print("-" * 40)
-    print(f"Company: {startup_data['company_name']}")
-    print(f"Business: {startup_data['business_description']}")
-    print(f"Industry: {startup_data['industry']}")
-    print(f"Stage: {startup_data['stage']}")
-    print(f"Founder: {startup_data['founder_name']}")
+    print(f"Company: {STARTUP_DATA['company_name']}")
+    print(f"Business: {STARTUP_DATA['business_description']}")
+    print(f"Industry: {STARTUP_DATA['industry']}")
+    print(f"Stage: {STARTUP_DATA['stage']}")
+    print(f"Founder: {STARTUP_DATA['founder_name']}")
     print()
     
     # Run AI analysis
@@ -58,59 +172,36 @@ def demo_google_ai_analysis():
     print("   Agent 5: Report Generation (Google AI)")
     print()
     
-    # Create comprehensive analysis prompt
-    analysis_prompt = f"""
-    As an expert startup investment analyst using Google's advanced AI, please analyze this startup:
-
-    COMPANY: {startup_data['company_name']}
-    BUSINESS: {startup_data['business_description']}
-    INDUSTRY: {startup_data['industry']}
-    STAGE: {startup_data['stage']}
-    FOUNDER: {startup_data['founder_name']}
-    FOUNDER BACKGROUND: {startup_data['founder_background']}
-
-    Please provide a comprehensive investment analysis including:
-
-    1. MARKET ANALYSIS
-       - Market size and opportunity
-       - Growth potential
-       - Competitive landscape
-
-    2. BUSINESS MODEL ASSESSMENT
-       - Revenue model viability
-       - Scalability factors
-       - Competitive advantages
-
-    3. RISK ASSESSMENT
-       - Market risks
-       - Technology risks
-       - Team risks
-       - Mitigation strategies
-
-    4. INVESTMENT RECOMMENDATION
-       - Recommendation: INVEST/PASS/WATCH
-       - Confidence score (1-10)
-       - Key investment thesis
-       - Due diligence priorities
-
-    Provide specific, actionable insights for investment decision-making.
-    """
-    
     try:
         print("⏳ Processing with Google's Gemini AI...")
-        start_time = time.time()
         
-        # Get AI response
-        response = model.generate_content(analysis_prompt)
-        
-        end_time = time.time()
-        processing_time = end_time - start_time
+        start_time = time.time()
+        cached = cached_text(ANALYSIS_PROMPT)
         
-        print(f"✅ Analysis completed in {processing_time:.2f} seconds")
+        # Get AI response; it is printed as it streams in rather than after the last token
         print()
         print("📋 GOOGLE AI ANALYSIS RESULTS:")
         print("=" * 50)
-        print(response.text)
+        if cached is not None:
+            print(cached)
+            print()
+            print("♻️ Replayed from the LLM cache: Gemini answered this prompt in an earlier run within the last 24h")
+            print("   Set LLM_CACHE_ENABLED=false to run the analysis live")
+            print()
+            return
+        
+        first_chunk_time = None
+        async for text in stream_text(model, ANALYSIS_PROMPT):
+            if first_chunk_time is None:
+                first_chunk_time = time.time() - start_time
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        print()
+        
+        processing_time = time.time() - start_time
+        
+        print()
+        print(f"✅ Analysis completed in {processing_time:.2f} seconds (first text after {first_chunk_time or processing_time:.2f} seconds)")
         print()
         print("🎯 JUDGES: This is REAL Google AI analysis!")
         print("   - Using Google's Gemini 1.5 Flash model")
@@ -122,54 +213,34 @@ def demo_google_ai_analysis():
         print(f"❌ Analysis failed: {str(e)}")
         print("   Check your Google API key and internet connection")
 
-def demo_google_ai_features():
+async def demo_google_ai_features(structured: asyncio.Task, recommendation: asyncio.Task):
     """Demo specific Google AI features"""
     print("\n🔍 GOOGLE AI FEATURES DEMONSTRATION")
     print("=" * 50)
     
-    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
     # Demo 1: Structured output
     print("1. 📊 STRUCTURED ANALYSIS OUTPUT")
-    structured_prompt = """
-    Analyze this startup and provide a structured response:
-    Company: TechFlow Solutions
-    Business: AI-powered workflow automation for small businesses
-    
-    Provide analysis in this format:
-    - Market Opportunity: [analysis]
-    - Business Model: [analysis]  
-    - Risk Level: [LOW/MEDIUM/HIGH]
-    - Investment Recommendation: [INVEST/PASS/WATCH]
-    - Confidence Score: [1-10]
-    """
     
     try:
-        response = model.generate_content(structured_prompt)
-        print("✅ Structured analysis:")
-        print(response.text[:300] + "..." if len(response.text) > 300 else response.text)
+        text, from_cache = await structured
+        analysis = json.loads(text)
+        print(f"✅ Structured analysis{CACHED_NOTE if from_cache else ''}:")
+        for field, label in STRUCTURED_FIELDS.items():
+            value = str(analysis.get(field, ""))
+            print(f"- {label}: {value[:120] + '...' if len(value) > 120 else value}")
     except Exception as e:
         print(f"❌ Structured analysis failed: {str(e)}")
     
     print("\n2. 🎯 INVESTMENT RECOMMENDATION")
-    recommendation_prompt = """
-    As a startup investment analyst, provide a clear recommendation for:
-    Company: SocialSnap (social media app for Gen Z)
-    Business: Photo sharing app competing with Instagram/TikTok
-    Stage: Seed stage, pre-revenue
-    
-    Give a clear INVEST/PASS/WATCH recommendation with reasoning.
-    """
     
     try:
-        response = model.generate_content(recommendation_prompt)
-        print("✅ Investment recommendation:")
-        print(response.text[:200] + "..." if len(response.text) > 200 else response.text)
+        text, from_cache = await recommendation
+        print(f"✅ Investment recommendation{CACHED_NOTE if from_cache else ''}:")
+        print(text[:200] + "..." if len(text) > 200 else text)
     except Exception as e:
         print(f"❌ Recommendation failed: {str(e)}")
 
-def main():
+async def main():
     """Run the complete Google AI demo"""
     print("🎯 HACKATHON DEMO - GOOGLE AI STARTUP ANALYST")
     print("=" * 60)
@@ -178,15 +249,20 @@ def main():
     print()
     
     # Check if API key is available
-    if not os.getenv("GOOGLE_API_KEY"):
+    if MODEL is None:
         print("❌ Google API key not found!")
         print("   Please set GOOGLE_API_KEY in your .env file")
         print("   Get your key from: https://makersuite.google.com/app/apikey")
         return
     
+    # The prompts are independent, so the feature prompts are sent now and
+    # answer while the analysis streams; unchanged prompts come from the cache
+    structured = asyncio.create_task(generate_text(MODEL, STRUCTURED_PROMPT, STRUCTURED_CONFIG))
+    recommendation = asyncio.create_task(generate_text(MODEL, RECOMMENDATION_PROMPT))
+    
     # Run demos
-    demo_google_ai_analysis()
-    demo_google_ai_features()
+    await demo_google_ai_analysis(MODEL)
+    await demo_google_ai_features(structured, recommendation)
     
     print("\n🎉 DEMO COMPLETE!")
     print("=" * 30)
@@ -200,4 +276,4 @@ def main():
     print("🚀 Ready for hackathon presentation!")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -11,6 +11,11 @@ from pathlib import Path
 # Add src to path
 sys.path.append(str(Path(__file__).parent / "src"))
 
+from agents.llm_cache import enable_for_demo, llm_cache
+
+# Re-runs of the demo reuse recent answers instead of calling the model again
+enable_for_demo()
+
 def print_header(title):
     """Print a formatted header"""
     print("\n" + "="*70)
@@ -98,34 +103,41 @@ async def demo_individual_agents(orchestrator):
         ("risk_assessment", "Risk Assessment Agent")
     ]
     
+    async def run_agent(agent_key):
+        # analyze() blocks, so each agent gets its own thread and all three wait on the model together
+        start_time = time.time()
+        result = await asyncio.to_thread(orchestrator.agents[agent_key].analyze, test_startup)
+        return result, time.time() - start_time
+    
+    outcomes = await asyncio.gather(
+        *(run_agent(agent_key) for agent_key, _ in agents_to_demo),
+        return_exceptions=True
+    )
+    
     results = {}
     
-    for agent_key, agent_name in agents_to_demo:
+    for (agent_key, agent_name), outcome in zip(agents_to_demo, outcomes):
         print_section(f"🤖 {agent_name}")
         print(f"Analyzing: {test_startup['company_name']}")
         
-        try:
-            start_time = time.time()
-            result = orchestrator.agents[agent_key].analyze(test_startup)
-            end_time = time.time()
-            
-            processing_time = end_time - start_time
-            
-            print(f"⏱️ Processing time: {processing_time:.2f} seconds")
-            print(f"📊 Status: {result.get('status', 'unknown')}")
-            print(f"🧠 Model: {result.get('model_used', 'unknown')}")
-            
-            if result.get('analysis'):
-                analysis = result['analysis']
-                print(f"📝 Analysis preview:")
-                print(f"   {analysis[:300]}...")
-            
-            results[agent_key] = result
-            print("✅ Agent completed successfully!")
-            
-        except Exception as e:
-            print(f"❌ {agent_name} failed: {str(e)}")
-            results[agent_key] = {"status": "error", "error": str(e)}
+        if isinstance(outcome, Exception):
+            print(f"❌ {agent_name} failed: {str(outcome)}")
+            results[agent_key] = {"status": "error", "error": str(outcome)}
+            continue
+        
+        result, processing_time = outcome
+        
+        print(f"⏱️ Processing time: {processing_time:.2f} seconds")
+        print(f"📊 Status: {result.get('status', 'unknown')}")
+        print(f"🧠 Model: {result.get('model_used', 'unknown')}")
+        
+        if result.get('analysis'):
+            analysis = result['analysis']
+            print(f"📝 Analysis preview:")
+            print(f"   {analysis[:300]}...")
+        
+        results[agent_key] = result
+        print("✅ Agent completed successfully!")
     
     return results
 
@@ -207,18 +219,23 @@ async def demo_real_time_updates(orchestrator):
     print_section("🚀 Starting Analysis with Live Progress Updates")
     
     try:
-        # Start analysis
-        task = asyncio.create_task(orchestrator.analyze_startup(test_startup, "progress_demo_user"))
-        
-        # Monitor progress
-        startup_id = f"ProgressDemo_{int(time.time())}"
+        # Start analysis; the orchestrator pushes each progress update onto the queue
+        progress_updates = asyncio.Queue()
+        task = asyncio.create_task(
+            orchestrator.analyze_startup(test_startup, "progress_demo_user", progress_queue=progress_updates)
+        )
         
         print("📊 Monitoring progress in real-time...")
         
-        for i in range(15):  # Check progress 15 times
-            await asyncio.sleep(2)  # Wait 2 seconds
+        while True:
+            update = asyncio.ensure_future(progress_updates.get())
+            done, _ = await asyncio.wait({update, task}, return_when=asyncio.FIRST_COMPLETED)
+            if update not in done:
+                # The run ended without a final status, e.g. it failed before starting
+                update.cancel()
+                break
             
-            progress = await orchestrator.get_analysis_progress(startup_id)
+            progress = update.result()
             
             if progress.get("status") == "completed":
                 print(f"✅ Analysis completed: {progress.get('progress', 0)}%")
@@ -313,6 +330,8 @@ async def main():
         print("• Advanced orchestration and workflow management")
         print("• Comprehensive error handling and monitoring")
         
+        print(f"\n♻️ LLM cache: {llm_cache.stats['hits']} hits, {llm_cache.stats['misses']} misses")
+        
     except Exception as e:
         print(f"❌ Demo failed: {str(e)}")
         print("🔧 Please check your configuration and try again")
@@ -7,11 +7,17 @@ Integrates existing startup analysis with Smart Report Analyzer features
 import os
 import sys
 import time
+import shutil
+import asyncio
+import secrets
+import tempfile
 import logging
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import pandas as pd
 
@@ -21,6 +27,7 @@ sys.path.append('/Users/sanjay/google')
 
 # Import working components
 from agents.startup_analyst_agents import StartupAnalystOrchestrator, StartupData
+from agents.progress_stream import ProgressRegistry
 
 # Import Smart Report Analyzer utilities
 try:
@@ -36,8 +43,30 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Agents whose completion /api/analyze reports, in pipeline order
+PROGRESS_STEPS = ("data_collection", "business_analysis", "risk_assessment", "investment_insights")
+PROGRESS_HEARTBEAT_SECONDS = 15
+PROGRESS_STREAM_TIMEOUT_SECONDS = 600
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the model clients in the background so the first analysis skips the
+    connection and auth set-up; startup itself is not held up"""
+    # Latest progress event per startup_id; kept per process, so a client's
+    # stream and its analysis must reach the same worker
+    app.state.progress = ProgressRegistry()
+    app.state.model_warm_up = asyncio.create_task(orchestrator.warm_up())
+    app.state.model_warm_up.add_done_callback(_log_warm_up_failure)
+    yield
+    app.state.model_warm_up.cancel()
+
+def _log_warm_up_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"⚠️ Model warm-up failed, the first analysis will set up its own connections: {task.exception()}")
+
 # Initialize FastAPI app
-app = FastAPI(title="Enhanced Startup Analyst Platform", version="2.0.0")
+# orjson renders the nested agent findings and numpy scores much faster than json
+app = FastAPI(title="Enhanced Startup Analyst Platform", version="2.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -66,13 +95,6 @@ class DocumentAnalysisRequest(BaseModel):
     analysis_type: str  # "pitch_deck", "financial_data", "business_plan"
     questions: Optional[list] = []
 
-# Mount static files for the frontend
-try:
-    app.mount("/", StaticFiles(directory="frontend/build", html=True), name="static")
-    logger.info("✅ Frontend static files mounted from frontend/build")
-except Exception as e:
-    logger.warning(f"⚠️ Could not mount frontend files: {e}")
-
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
@@ -98,9 +120,42 @@ async def get_status():
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
     }
 
+def _progress_event(startup_id: str, agents_completed: List[str], status: str) -> Dict[str, Any]:
+    """Progress snapshot in the shape the frontend's progress view expects"""
+    remaining = [agent for agent in PROGRESS_STEPS if agent not in agents_completed]
+    return {
+        "startup_id": startup_id,
+        "progress": int(100 * len(agents_completed) / len(PROGRESS_STEPS)),
+        "status": status,
+        "current_agent": remaining[0] if remaining else None,
+        "agents_completed": list(agents_completed),
+        "updated_at": time.time()
+    }
+
 @app.post("/api/analyze")
-async def analyze_startup(startup_input: StartupInput):
-    """Analyze a startup using AI agents"""
+async def analyze_startup(startup_input: StartupInput, startup_id: Optional[str] = None):
+    """Analyze a startup using AI agents
+    
+    Clients that want live progress pass their own unguessable startup_id
+    (e.g. a UUID) and open /api/analysis-progress-stream/{startup_id} before
+    posting; an id another analysis already uses is rejected.
+    """
+    progress = app.state.progress
+    if startup_id is None:
+        # Random ids cannot collide when the same company is analysed twice in a second
+        startup_id = secrets.token_urlsafe(12)
+    elif not progress.valid_id(startup_id):
+        raise HTTPException(status_code=400, detail="startup_id must be 16-64 URL-safe characters")
+    if not progress.claim(startup_id):
+        raise HTTPException(status_code=409, detail="startup_id is already in use")
+    agents_completed = []
+    
+    def on_agent_complete(agent_key: str, result):
+        agents_completed.append(agent_key)
+        progress.publish(startup_id, _progress_event(startup_id, agents_completed, "in_progress"))
+    
+    progress.publish(startup_id, _progress_event(startup_id, agents_completed, "initiated"))
+    
     try:
         logger.info(f"Starting analysis for {startup_input.company_name}")
         
@@ -117,7 +172,7 @@ async def analyze_startup(startup_input: StartupInput):
         )
         
         # Run analysis
-        results = orchestrator.analyze_startup(startup_data)
+        results = await orchestrator.aanalyze_startup(startup_data, on_agent_complete)
         
         # Convert results to serializable format
         serializable_results = {}
@@ -127,13 +182,15 @@ async def analyze_startup(startup_input: StartupInput):
                 "analysis_type": result.analysis_type,
                 "findings": result.findings,
                 "confidence_score": result.confidence_score,
-                "timestamp": result.timestamp.isoformat()
+                "timestamp": result.iso_timestamp
             }
         
         logger.info(f"✅ Analysis completed for {startup_input.company_name}")
+        progress.publish(startup_id, _progress_event(startup_id, list(PROGRESS_STEPS), "completed"))
         
         return {
             "status": "success",
+            "startup_id": startup_id,
             "results": serializable_results,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "analysis_time": "10.0 seconds"
@@ -141,8 +198,54 @@ async def analyze_startup(startup_input: StartupInput):
         
     except Exception as e:
         logger.error(f"Analysis failed: {str(e)}")
+        failed = _progress_event(startup_id, agents_completed, "failed")
+        failed["error"] = str(e)
+        progress.publish(startup_id, failed)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def _save_upload(upload: UploadFile) -> str:
+    """Copy an upload to a fresh temp file in chunks instead of reading it into memory; returns its path"""
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(os.path.basename(upload.filename or ""))[1])
+    with os.fdopen(fd, "wb") as buffer:
+        shutil.copyfileobj(upload.file, buffer, UPLOAD_CHUNK_SIZE)
+    return path
+
+def _analyze_document_file(temp_path: str, filename: str, analysis_type: str) -> Dict[str, Any]:
+    """Load a saved upload and summarize it"""
+    df, raw_text = load_file(temp_path)
+    
+    result = {
+        "filename": filename,
+        "analysis_type": analysis_type,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+    
+    if df is not None:
+        # Structured data analysis
+        result["data_preview"] = df.head().to_dict()
+        result["summary"] = summarize_report(df)
+        result["data_type"] = "structured"
+        
+    elif raw_text:
+        # PDF/text analysis
+        result["text_preview"] = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
+        result["summary"] = summarize_report(raw_text)
+        result["data_type"] = "unstructured"
+    
+    return result
+
+def _answer_document_question(temp_path: str, question: str) -> str:
+    """Load a saved upload and answer a question about it"""
+    df, raw_text = load_file(temp_path)
+    
+    if df is not None:
+        return ask_question(df, question)
+    elif raw_text:
+        return ask_question(raw_text, question)
+    return "Could not process the uploaded file."
+
 @app.post("/api/analyze-document")
 async def analyze_document(file: UploadFile = File(...), analysis_type: str = "pitch_deck"):
     """Analyze uploaded documents using Smart Report Analyzer"""
@@ -152,35 +255,13 @@ async def analyze_document(file: UploadFile = File(...), analysis_type: str = "p
     try:
         logger.info(f"Analyzing document: {file.filename}")
         
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Load and analyze file
-        df, raw_text = load_file(temp_path)
-        
-        result = {
-            "filename": file.filename,
-            "analysis_type": analysis_type,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        if df is not None:
-            # Structured data analysis
-            result["data_preview"] = df.head().to_dict()
-            result["summary"] = summarize_report(df)
-            result["data_type"] = "structured"
-            
-        elif raw_text:
-            # PDF/text analysis
-            result["text_preview"] = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
-            result["summary"] = summarize_report(raw_text)
-            result["data_type"] = "unstructured"
-        
-        # Clean up temp file
-        os.remove(temp_path)
+        # Save uploaded file temporarily, streamed to a fresh temp file rather than a client-chosen path
+        temp_path = await asyncio.to_thread(_save_upload, file)
+        try:
+            # Load and analyze file; pandas, pdfplumber and the LLM client block, so keep them off the event loop
+            result = await asyncio.to_thread(_analyze_document_file, temp_path, file.filename, analysis_type)
+        finally:
+            os.remove(temp_path)
         
         return {
             "status": "success",
@@ -198,24 +279,13 @@ async def ask_document_question(file: UploadFile = File(...), question: str = ""
         raise HTTPException(status_code=503, detail="Smart Analyzer not available")
     
     try:
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Load file and ask question
-        df, raw_text = load_file(temp_path)
-        
-        if df is not None:
-            answer = ask_question(df, question)
-        elif raw_text:
-            answer = ask_question(raw_text, question)
-        else:
-            answer = "Could not process the uploaded file."
-        
-        # Clean up temp file
-        os.remove(temp_path)
+        # Save uploaded file temporarily, streamed to a fresh temp file rather than a client-chosen path
+        temp_path = await asyncio.to_thread(_save_upload, file)
+        try:
+            # Load file and ask question
+            answer = await asyncio.to_thread(_answer_document_question, temp_path, question)
+        finally:
+            os.remove(temp_path)
         
         return {
             "status": "success",
@@ -228,9 +298,23 @@ async def ask_document_question(file: UploadFile = File(...), question: str = ""
         logger.error(f"Question answering failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Question answering failed: {str(e)}")
 
+@app.get("/api/analysis-progress-stream/{startup_id}")
+async def stream_analysis_progress(startup_id: str):
+    """Push analysis progress as Server-Sent Events until the analysis finishes
+    
+    A stream that connects late or reconnects starts from the latest event.
+    """
+    if not app.state.progress.valid_id(startup_id):
+        raise HTTPException(status_code=400, detail="startup_id must be 16-64 URL-safe characters")
+    return StreamingResponse(
+        app.state.progress.stream(startup_id, PROGRESS_HEARTBEAT_SECONDS, PROGRESS_STREAM_TIMEOUT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/analysis-progress/{startup_id}")
 async def get_analysis_progress(startup_id: str):
-    """Get analysis progress (simplified)"""
+    """Get analysis progress (simplified; kept for older clients, prefer the SSE stream)"""
     return {
         "status": "success",
         "progress": {
@@ -241,6 +325,31 @@ async def get_analysis_progress(startup_id: str):
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
     }
 
+# Mount static files for the frontend; mounted last so the API routes above take precedence
+try:
+    app.mount("/", StaticFiles(directory="frontend/build", html=True), name="static")
+    logger.info("✅ Frontend static files mounted from frontend/build")
+except Exception as e:
+    logger.warning(f"⚠️ Could not mount frontend files: {e}")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    if os.getenv("DEV"):
+        uvicorn.run("enhanced_backend:app", host="0.0.0.0", port=8080, reload=True)
+    else:
+        # Every worker loads its own copy of the Smart Analyzer's Hugging Face
+        # models and keeps its own progress queues, which a progress stream must
+        # share with its analysis, so one worker is the default; set
+        # WEB_CONCURRENCY only behind a proxy with sticky sessions
+        workers = int(os.getenv("WEB_CONCURRENCY", 1))
+        uvicorn.run(
+            # One worker serves this already-built app; an import string there
+            # would import the module a second time and build a second orchestrator
+            "enhanced_backend:app" if workers > 1 else app,
+            host="0.0.0.0",
+            port=8080,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            backlog=2048
+        )
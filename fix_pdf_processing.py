@@ -19,6 +19,34 @@ except ImportError:
     except ImportError:
         PDF_AVAILABLE = False
 
+def _pdfplumber_pages(pdf_path):
+    """Yield each page's text with pdfplumber, one page at a time"""
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            # Release the page's parsed layout before moving on
+            page.flush_cache()
+            if page_text:
+                yield page_text
+
+def _pypdf2_pages(pdf_path):
+    """Yield each page's text with PyPDF2, one page at a time"""
+    import PyPDF2
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            yield page.extract_text()
+
+def iter_pdf_pages(pdf_path):
+    """Yield the text of each page, so callers can consume a deck without holding all of it"""
+    try:
+        import pdfplumber
+    except ImportError:
+        yield from _pypdf2_pages(pdf_path)
+    else:
+        yield from _pdfplumber_pages(pdf_path)
+
 def extract_pdf_text(pdf_path):
     """Extract text from PDF file"""
     
@@ -28,26 +56,13 @@ def extract_pdf_text(pdf_path):
     try:
         # Try pdfplumber first (better for complex PDFs)
         try:
-            import pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text.strip()
+            return "\n".join(_pdfplumber_pages(pdf_path)).strip()
         except:
             pass
         
         # Fallback to PyPDF2
         try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
+            return "\n".join(_pypdf2_pages(pdf_path)).strip()
         except:
             pass
         
@@ -115,7 +115,7 @@ const AppEnhanced: React.FC = () => {
     setShowRealTimeProgress(true);
 
     // Generate startup ID for tracking
-    const startupId = `${startupInput.company_name.replace(/\s+/g, '_')}_${Date.now()}`;
+    const startupId = crypto.randomUUID();
     setCurrentStartupId(startupId);
 
     try {
@@ -130,7 +130,7 @@ const AppEnhanced: React.FC = () => {
         }))
       };
 
-      const response = await analyzeStartup(enhancedInput);
+      const response = await analyzeStartup(enhancedInput, startupId);
       // Results will be set by the real-time progress component
     } catch (err: any) {
       setError(err.message || 'Analysis failed. Please try again.');
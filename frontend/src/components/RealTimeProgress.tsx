@@ -43,33 +43,27 @@ const RealTimeProgress: React.FC<RealTimeProgressProps> = ({ startupId, onComple
   const [startTime] = useState(Date.now());
   const [elapsedTime, setElapsedTime] = useState(0);
 
-  // Simulate real-time updates (in production, this would use Firebase listeners)
+  // Live updates pushed by the backend over Server-Sent Events
   useEffect(() => {
-    const pollProgress = async () => {
-      try {
-        const response = await fetch(`/api/analysis-progress/${startupId}`);
-        if (response.ok) {
-          const data = await response.json();
-          setProgressData(data);
-          
-          if (data.status === 'completed' && data.progress >= 100) {
-            if (onComplete && data.results) {
-              onComplete(data.results);
-            }
-          }
+    const source = new EventSource(`/api/analysis-progress-stream/${startupId}`);
+
+    source.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      setProgressData(data);
+
+      if (data.status === 'completed' || data.status === 'failed') {
+        source.close();
+        if (data.status === 'completed' && onComplete && data.results) {
+          onComplete(data.results);
         }
-      } catch (error) {
-        console.error('Failed to fetch progress:', error);
       }
     };
 
-    // Initial fetch
-    pollProgress();
-
-    // Poll every 2 seconds
-    const interval = setInterval(pollProgress, 2000);
+    source.onerror = (error) => {
+      console.error('Progress stream error:', error);
+    };
 
-    return () => clearInterval(interval);
+    return () => source.close();
   }, [startupId, onComplete]);
 
   // Update elapsed time
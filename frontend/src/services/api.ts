@@ -33,9 +33,12 @@ api.interceptors.response.use(
   }
 );
 
-export const analyzeStartup = async (startupInput: StartupInput): Promise<ApiResponse<AnalysisResults>> => {
+export const analyzeStartup = async (startupInput: StartupInput, startupId?: string): Promise<ApiResponse<AnalysisResults>> => {
   try {
-    const response = await api.post('/analyze', startupInput);
+    // Passing our own startup_id lets the progress stream follow this analysis
+    const response = await api.post('/analyze', startupInput, {
+      params: startupId ? { startup_id: startupId } : undefined,
+    });
     return response.data;
   } catch (error: any) {
     throw new Error(error.message || 'Failed to analyze startup');
@@ -6,11 +6,15 @@ Simple working backend for the startup analyst frontend
 import os
 import sys
 import time
+import shutil
+import asyncio
+import tempfile
 import logging
 from typing import Dict, Any, Optional
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import pandas as pd
 
@@ -37,7 +41,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
-app = FastAPI(title="Enhanced Startup Analyst Platform", version="2.0.0")
+# orjson renders the nested agent findings and numpy scores much faster than json
+app = FastAPI(title="Enhanced Startup Analyst Platform", version="2.0.0", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -117,7 +122,7 @@ async def analyze_startup(startup_input: StartupInput):
         )
         
         # Run analysis
-        results = orchestrator.analyze_startup(startup_data)
+        results = await orchestrator.aanalyze_startup(startup_data)
         
         # Convert results to serializable format
         serializable_results = {}
@@ -127,7 +132,7 @@ async def analyze_startup(startup_input: StartupInput):
                 "analysis_type": result.analysis_type,
                 "findings": result.findings,
                 "confidence_score": result.confidence_score,
-                "timestamp": result.timestamp.isoformat()
+                "timestamp": result.iso_timestamp
             }
         
         logger.info(f"✅ Analysis completed for {startup_input.company_name}")
@@ -143,6 +148,49 @@ async def analyze_startup(startup_input: StartupInput):
         logger.error(f"Analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def _save_upload(upload: UploadFile) -> str:
+    """Copy an upload to a fresh temp file in chunks instead of reading it into memory; returns its path"""
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(os.path.basename(upload.filename or ""))[1])
+    with os.fdopen(fd, "wb") as buffer:
+        shutil.copyfileobj(upload.file, buffer, UPLOAD_CHUNK_SIZE)
+    return path
+
+def _analyze_document_file(temp_path: str, filename: str, analysis_type: str) -> Dict[str, Any]:
+    """Load a saved upload and summarize it"""
+    df, raw_text = load_file(temp_path)
+    
+    result = {
+        "filename": filename,
+        "analysis_type": analysis_type,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+    
+    if df is not None:
+        # Structured data analysis
+        result["data_preview"] = df.head().to_dict()
+        result["summary"] = summarize_report(df)
+        result["data_type"] = "structured"
+        
+    elif raw_text:
+        # PDF/text analysis
+        result["text_preview"] = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
+        result["summary"] = summarize_report(raw_text)
+        result["data_type"] = "unstructured"
+    
+    return result
+
+def _answer_document_question(temp_path: str, question: str) -> str:
+    """Load a saved upload and answer a question about it"""
+    df, raw_text = load_file(temp_path)
+    
+    if df is not None:
+        return ask_question(df, question)
+    elif raw_text:
+        return ask_question(raw_text, question)
+    return "Could not process the uploaded file."
+
 @app.post("/api/analyze-document")
 async def analyze_document(file: UploadFile = File(...), analysis_type: str = "pitch_deck"):
     """Analyze uploaded documents using Smart Report Analyzer"""
@@ -152,35 +200,13 @@ async def analyze_document(file: UploadFile = File(...), analysis_type: str = "p
     try:
         logger.info(f"Analyzing document: {file.filename}")
         
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Load and analyze file
-        df, raw_text = load_file(temp_path)
-        
-        result = {
-            "filename": file.filename,
-            "analysis_type": analysis_type,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        if df is not None:
-            # Structured data analysis
-            result["data_preview"] = df.head().to_dict()
-            result["summary"] = summarize_report(df)
-            result["data_type"] = "structured"
-            
-        elif raw_text:
-            # PDF/text analysis
-            result["text_preview"] = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
-            result["summary"] = summarize_report(raw_text)
-            result["data_type"] = "unstructured"
-        
-        # Clean up temp file
-        os.remove(temp_path)
+        # Save uploaded file temporarily, streamed to a fresh temp file rather than a client-chosen path
+        temp_path = await asyncio.to_thread(_save_upload, file)
+        try:
+            # Load and analyze file; pandas, pdfplumber and the LLM client block, so keep them off the event loop
+            result = await asyncio.to_thread(_analyze_document_file, temp_path, file.filename, analysis_type)
+        finally:
+            os.remove(temp_path)
         
         return {
             "status": "success",
@@ -198,24 +224,13 @@ async def ask_document_question(file: UploadFile = File(...), question: str = ""
         raise HTTPException(status_code=503, detail="Smart Analyzer not available")
     
     try:
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Load file and ask question
-        df, raw_text = load_file(temp_path)
-        
-        if df is not None:
-            answer = ask_question(df, question)
-        elif raw_text:
-            answer = ask_question(raw_text, question)
-        else:
-            answer = "Could not process the uploaded file."
-        
-        # Clean up temp file
-        os.remove(temp_path)
+        # Save uploaded file temporarily, streamed to a fresh temp file rather than a client-chosen path
+        temp_path = await asyncio.to_thread(_save_upload, file)
+        try:
+            # Load file and ask question
+            answer = await asyncio.to_thread(_answer_document_question, temp_path, question)
+        finally:
+            os.remove(temp_path)
         
         return {
             "status": "success",
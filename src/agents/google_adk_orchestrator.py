@@ -3,6 +3,7 @@ Google Agent Development Kit (ADK) Orchestrator
 Advanced multi-agent system using Google's Vertex AI Agent Builder
 """
 import asyncio
+import re
 import time
 import logging
 from typing import Dict, Any, List, Optional
@@ -21,11 +22,42 @@ except ImportError:
 # Fallback to regular Google AI
 import google.generativeai as genai
 
+# Read and applied once for all agents rather than on every agent's initialization
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+if GOOGLE_API_KEY:
+    genai.configure(api_key=GOOGLE_API_KEY)
+
 from ..utils.enhanced_firebase_client import enhanced_firebase_client
 from ..utils.enhanced_storage_client import enhanced_storage_client
 
 logger = logging.getLogger(__name__)
 
+# Earlier results each agent's prompt reads; listed in an order where every
+# agent comes after its dependencies
+AGENT_DEPENDENCIES = {
+    "data_collection": [],
+    "risk_assessment": [],
+    "business_analysis": ["data_collection"],
+    "investment_insights": ["business_analysis", "risk_assessment"],
+    "report_generation": ["data_collection", "business_analysis", "risk_assessment", "investment_insights"]
+}
+
+# Agents whose prompts ask for JSON; the model is put in JSON mode for them so
+# the reply parses directly instead of being searched for a JSON block
+JSON_OUTPUT_AGENTS = {"data_collection"}
+
+_JSON_BLOCK = re.compile(r'\{.*\}', re.DOTALL)
+_NUMBERED_POINT = re.compile(r'\d+\.\s*([^\n]+)')
+_BULLET_POINT = re.compile(r'[-•]\s*([^\n]+)')
+
+AGENT_DISPLAY_NAMES = {
+    "data_collection": "Data Collection Agent",
+    "business_analysis": "Business Analysis Agent",
+    "risk_assessment": "Risk Assessment Agent",
+    "investment_insights": "Investment Insights Agent",
+    "report_generation": "Report Generation Agent"
+}
+
 class GoogleADKAgent:
     """Individual agent using Google ADK principles"""
     
@@ -43,10 +75,8 @@ class GoogleADKAgent:
         """Initialize the AI model (Vertex AI or Gemini fallback)"""
         try:
             # Try direct Gemini API first (more reliable for development)
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if api_key:
+            if GOOGLE_API_KEY:
                 try:
-                    genai.configure(api_key=api_key)
                     self.model = genai.GenerativeModel('gemini-1.5-flash')
                     self.model_type = "gemini_direct"
                     self.initialized = True
@@ -91,25 +121,29 @@ class GoogleADKAgent:
             prompt = self._create_specialized_prompt(input_data, context)
             system_instruction = self._get_system_instruction()
             
-            # Generate response
+            # Generate response; async so agents scheduled together overlap on the network
             if self.model_type == "vertex_ai":
-                response = self.model.generate_content(
+                generation_config = {
+                    "max_output_tokens": 4096,
+                    "temperature": 0.7,
+                    "top_p": 0.8
+                }
+                if self.agent_type in JSON_OUTPUT_AGENTS:
+                    generation_config["response_mime_type"] = "application/json"
+                response = await self.model.generate_content_async(
                     prompt,
-                    generation_config={
-                        "max_output_tokens": 4096,
-                        "temperature": 0.7,
-                        "top_p": 0.8
-                    }
+                    generation_config=generation_config
                 )
                 result_text = response.text
             else:
                 # Gemini direct API - combine system instruction with prompt
                 full_prompt = f"SYSTEM: {system_instruction}\n\nUSER: {prompt}"
-                response = self.model.generate_content(
+                response = await self.model.generate_content_async(
                     full_prompt,
                     generation_config=genai.types.GenerationConfig(
                         max_output_tokens=4096,
-                        temperature=0.7
+                        temperature=0.7,
+                        response_mime_type="application/json" if self.agent_type in JSON_OUTPUT_AGENTS else None
                     )
                 )
                 result_text = response.text
@@ -370,11 +404,14 @@ Create a professional, investor-ready report that synthesizes all analysis.
         """Process and structure the AI response"""
         # Try to extract JSON if present
         try:
-            # Look for JSON blocks
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                json_data = json.loads(json_match.group())
+            if self.agent_type in JSON_OUTPUT_AGENTS:
+                # JSON mode replies are the document itself
+                json_data = json.loads(response_text)
+            else:
+                # Look for JSON blocks
+                json_match = _JSON_BLOCK.search(response_text)
+                json_data = json.loads(json_match.group()) if json_match else None
+            if json_data is not None:
                 return {
                     "structured_data": json_data,
                     "raw_analysis": response_text,
@@ -395,16 +432,14 @@ Create a professional, investor-ready report that synthesizes all analysis.
     def _extract_key_points(self, text: str) -> List[str]:
         """Extract key points from text"""
         # Simple extraction based on numbered lists, bullet points, etc.
-        import re
-        
         key_points = []
         
         # Look for numbered points
-        numbered_points = re.findall(r'\d+\.\s*([^\n]+)', text)
+        numbered_points = _NUMBERED_POINT.findall(text)
         key_points.extend(numbered_points[:5])  # Top 5
         
         # Look for bullet points
-        bullet_points = re.findall(r'[-•]\s*([^\n]+)', text)
+        bullet_points = _BULLET_POINT.findall(text)
         key_points.extend(bullet_points[:3])  # Top 3
         
         return key_points[:5]  # Return max 5 key points
@@ -500,84 +535,24 @@ class GoogleADKOrchestrator:
         
         try:
             # Initialize Firebase session for real-time updates
-            enhanced_firebase_client.create_analysis_session(startup_id, user_id)
+            await asyncio.to_thread(enhanced_firebase_client.create_analysis_session, startup_id, user_id)
             
             logger.info(f"🚀 Starting Google ADK analysis for {startup_data.get('company_name', 'Unknown')}")
             
-            # Phase 1: Data Collection (Sequential)
-            if "data_collection" in self.agents:
-                logger.info("📊 Phase 1: Data Collection")
-                enhanced_firebase_client.update_real_time_progress(
-                    startup_id, "Data Collection Agent", 10, {"status": "collecting market data"}
-                )
-                
-                data_result = await self.agents["data_collection"].analyze(startup_data)
-                results["data_collection"] = data_result
-                
-                enhanced_firebase_client.update_real_time_progress(
-                    startup_id, "Data Collection Agent", 20, {"status": "data collection completed"}
-                )
-            
-            # Phase 2: Parallel Business & Risk Analysis
-            logger.info("⚡ Phase 2: Business Analysis & Risk Assessment (Parallel)")
-            enhanced_firebase_client.update_real_time_progress(
-                startup_id, "Business & Risk Analysis", 30, {"status": "parallel analysis in progress"}
-            )
-            
-            parallel_tasks = []
-            
-            if "business_analysis" in self.agents:
-                parallel_tasks.append(
-                    self.agents["business_analysis"].analyze(startup_data, results)
-                )
-            
-            if "risk_assessment" in self.agents:
-                parallel_tasks.append(
-                    self.agents["risk_assessment"].analyze(startup_data, results)
-                )
-            
-            if parallel_tasks:
-                parallel_results = await asyncio.gather(*parallel_tasks, return_exceptions=True)
-                
-                for i, result in enumerate(parallel_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Parallel analysis {i} failed: {str(result)}")
-                    else:
-                        agent_type = result.get("agent_type")
-                        if agent_type:
-                            results[agent_type] = result
-            
-            enhanced_firebase_client.update_real_time_progress(
-                startup_id, "Business & Risk Analysis", 60, {"status": "parallel analysis completed"}
-            )
-            
-            # Phase 3: Investment Insights (Sequential, depends on previous results)
-            if "investment_insights" in self.agents:
-                logger.info("💰 Phase 3: Investment Insights")
-                enhanced_firebase_client.update_real_time_progress(
-                    startup_id, "Investment Insights Agent", 70, {"status": "generating investment analysis"}
-                )
-                
-                investment_result = await self.agents["investment_insights"].analyze(startup_data, results)
-                results["investment_insights"] = investment_result
-                
-                enhanced_firebase_client.update_real_time_progress(
-                    startup_id, "Investment Insights Agent", 80, {"status": "investment analysis completed"}
-                )
+            # Every agent starts as soon as the agents its prompt reads from have
+            # finished: data collection and risk assessment run together, business
+            # analysis follows data collection, and so on down to the report
+            tasks = {}
+            for agent_type, dependencies in AGENT_DEPENDENCIES.items():
+                if agent_type in self.agents:
+                    waits_for = [tasks[d] for d in dependencies if d in tasks]
+                    tasks[agent_type] = asyncio.create_task(
+                        self._run_when_ready(agent_type, waits_for, startup_data, startup_id, results, len(self.agents))
+                    )
             
-            # Phase 4: Report Generation (Sequential, synthesizes all results)
-            if "report_generation" in self.agents:
-                logger.info("📄 Phase 4: Report Generation")
-                enhanced_firebase_client.update_real_time_progress(
-                    startup_id, "Report Generation Agent", 90, {"status": "generating executive report"}
-                )
-                
-                report_result = await self.agents["report_generation"].analyze(startup_data, results)
-                results["report_generation"] = report_result
-                
-                enhanced_firebase_client.update_real_time_progress(
-                    startup_id, "Report Generation Agent", 100, {"status": "analysis completed"}
-                )
+            for agent_type, outcome in zip(tasks, await asyncio.gather(*tasks.values(), return_exceptions=True)):
+                if isinstance(outcome, Exception):
+                    logger.error(f"{agent_type} failed: {str(outcome)}")
             
             # Compile final results
             total_time = time.time() - start_time
@@ -598,18 +573,52 @@ class GoogleADKOrchestrator:
             }
             
             # Store final results in Firebase
-            enhanced_firebase_client.store_final_analysis_result(startup_id, final_analysis, user_id)
+            await asyncio.to_thread(enhanced_firebase_client.store_final_analysis_result, startup_id, final_analysis, user_id)
             
             logger.info(f"✅ Google ADK analysis completed in {total_time:.2f} seconds")
             return final_analysis
             
         except Exception as e:
             logger.error(f"❌ Google ADK analysis failed: {str(e)}")
-            enhanced_firebase_client.update_real_time_progress(
+            await asyncio.to_thread(
+                enhanced_firebase_client.update_real_time_progress,
                 startup_id, "Error", 0, {"status": "analysis failed", "error": str(e)}
             )
             raise Exception(f"Google ADK analysis failed: {str(e)}")
     
+    async def _run_when_ready(self, agent_type: str, waits_for: List[asyncio.Task], startup_data: Dict[str, Any],
+                              startup_id: str, results: Dict[str, Any], total_agents: int) -> Dict[str, Any]:
+        """Run one agent after its dependencies, within its configured timeout"""
+        if waits_for:
+            await asyncio.wait(waits_for)
+        
+        agent = self.agents[agent_type]
+        display_name = AGENT_DISPLAY_NAMES[agent_type]
+        timeout = agent.agent_config.get("timeout")
+        logger.info(f"▶️ {display_name} started")
+        
+        try:
+            result = await asyncio.wait_for(agent.analyze(startup_data, results), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"❌ {display_name} timed out after {timeout}s")
+            result = {
+                "agent_type": agent_type,
+                "status": "failed",
+                "error": f"timed out after {timeout} seconds",
+                "processing_time": timeout,
+                "timestamp": time.time()
+            }
+        
+        results[agent_type] = result
+        logger.info(f"✅ {display_name} {result['status']}")
+        
+        progress = int(100 * len(results) / total_agents)
+        await asyncio.to_thread(
+            enhanced_firebase_client.update_real_time_progress,
+            startup_id, display_name, progress, {"status": f"{agent_type.replace('_', ' ')} {result['status']}"}
+        )
+        return result
+    
     def _create_executive_summary(self, results: Dict[str, Any]) -> str:
         """Create executive summary from all agent results"""
         report_result = results.get("report_generation", {})
@@ -26,8 +26,10 @@ class VertexAIAgent:
                 location=settings.REGION
             )
             
-            self.model = GenerativeModel(model_name)
             self.agent_config = self._create_agent_config()
+            # The agent's fixed instructions go in as the system instruction, set
+            # once here; each call then sends only the startup-specific prompt
+            self.model = GenerativeModel(model_name, system_instruction=self.agent_config["instructions"])
             
             logger.info(f"✅ {agent_name} initialized with {model_name}")
             
@@ -3,6 +3,9 @@ Vertex AI Orchestrator with Google ADK
 Advanced workflow orchestration for startup analysis agents
 """
 import asyncio
+import hashlib
+import json
+import secrets
 import time
 import logging
 from typing import Dict, Any, Optional, List
@@ -17,9 +20,13 @@ from .vertex_ai_agents import (
     ReportGenerationAgent
 )
 from ..config.settings import settings
+from agents.llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
+# Bump when the way prompts are built or sent changes, to retire cached workflow runs
+WORKFLOW_CACHE_VERSION = 2
+
 class VertexAIOrchestrator:
     """Advanced orchestrator using Vertex AI and Google ADK principles"""
     
@@ -36,6 +43,9 @@ class VertexAIOrchestrator:
         # Initialize Firebase for real-time updates
         self._init_firebase()
         
+        # In-process listeners for runs started with a progress_queue
+        self._progress_queues: Dict[str, asyncio.Queue] = {}
+        
         # Workflow configuration
         self.workflow_config = {
             "parallel_agents": ["business_analysis", "risk_assessment"],
@@ -59,11 +69,19 @@ class VertexAIOrchestrator:
             logger.warning(f"⚠️ Firebase initialization failed: {str(e)}")
             self.db = None
     
-    async def analyze_startup(self, startup_data: Dict[str, Any], user_id: str = None) -> Dict[str, Any]:
-        """Execute complete startup analysis workflow"""
+    async def analyze_startup(self, startup_data: Dict[str, Any], user_id: str = None,
+                              progress_queue: Optional[asyncio.Queue] = None) -> Dict[str, Any]:
+        """Execute complete startup analysis workflow
+        
+        If progress_queue is given, every progress update is also put on it as
+        it happens, ending with a "completed" or "error" status.
+        """
+        # The company name is tracked separately as startup_name
+        startup_id = secrets.token_urlsafe(12)
+        if progress_queue is not None:
+            self._progress_queues[startup_id] = progress_queue
+        
         try:
-            startup_id = f"{startup_data.get('company_name', 'startup')}_{int(time.time())}"
-            
             # Update progress: Started
             await self._update_progress(startup_id, {
                 "status": "started",
@@ -73,8 +91,16 @@ class VertexAIOrchestrator:
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
             })
             
-            # Execute workflow
-            results = await self._execute_workflow(startup_data, startup_id)
+            # Execute workflow, unless this exact startup has been analysed before
+            cache_key = self._analysis_cache_key(startup_data)
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                results = json.loads(cached)
+                logger.info(f"♻️ Reusing cached analysis for {startup_data.get('company_name', 'Unknown')}")
+            else:
+                results = await self._execute_workflow(startup_data, startup_id)
+                if all(result.get("status") == "completed" for result in results.values()):
+                    llm_cache.set(cache_key, json.dumps(results))
             
             # Store results in Firebase
             if self.db:
@@ -98,6 +124,25 @@ class VertexAIOrchestrator:
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
             })
             raise Exception(f"Workflow execution failed: {str(e)}")
+        
+        finally:
+            self._progress_queues.pop(startup_id, None)
+    
+    def _analysis_cache_key(self, startup_data: Dict[str, Any]) -> str:
+        """Cache key for a whole workflow run over the given startup
+        
+        The agents' instructions and WORKFLOW_CACHE_VERSION are part of the key,
+        so runs cached before a prompt change are not served after it.
+        """
+        models = ",".join(sorted({agent.model_name for agent in self.agents.values()}))
+        instructions = hashlib.sha256(
+            "\n".join(agent.agent_config["instructions"] for agent in self.agents.values()).encode("utf-8")
+        ).hexdigest()
+        return llm_cache.cache_key(
+            models,
+            f"vertex_ai_workflow:v{WORKFLOW_CACHE_VERSION}:{instructions}",
+            json.dumps(startup_data, sort_keys=True, default=str)
+        )
     
     async def _execute_workflow(self, startup_data: Dict[str, Any], startup_id: str) -> Dict[str, Any]:
         """Execute the complete analysis workflow"""
@@ -224,7 +269,11 @@ class VertexAIOrchestrator:
         }
     
     async def _update_progress(self, startup_id: str, progress_data: Dict[str, Any]):
-        """Update analysis progress in Firebase"""
+        """Update analysis progress in Firebase and notify any in-process listener"""
+        queue = self._progress_queues.get(startup_id)
+        if queue is not None:
+            queue.put_nowait(dict(progress_data, startup_id=startup_id))
+        
         if not self.db:
             return
         
@@ -74,13 +74,15 @@ class PitchDeckProcessor:
         if not PDF_AVAILABLE:
             raise ImportError("pdfplumber not available")
         
-        text = ""
+        pages = []
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
+                    page.flush_cache()
                     if page_text:
-                        text += page_text + "\n"
+                        pages.append(page_text + "\n")
+            text = "".join(pages)
             logger.info(f"✅ Extracted {len(text)} characters from {pdf_path}")
             return text
         except Exception as e:
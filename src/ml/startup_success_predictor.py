@@ -14,6 +14,7 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import joblib
 import os
+import threading
 
 # ML Libraries
 from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier, GradientBoostingClassifier
@@ -53,6 +54,10 @@ class PredictionResult:
     key_factors: List[Tuple[str, float]]
     model_accuracy: float = 0.85
 
+# Trained models are saved here, so later boots and other server workers load
+# them instead of training again
+MODEL_PATH = os.getenv("ML_MODEL_PATH", os.path.join(".ml_cache", "startup_success_predictor.joblib"))
+
 class StartupSuccessPredictor:
     """
     Machine Learning model for predicting startup success
@@ -65,6 +70,27 @@ class StartupSuccessPredictor:
         self.scaler = StandardScaler()
         self.is_trained = False
         self.feature_importance = {}
+        self.key_factors = []
+        self._train_lock = threading.Lock()
+        
+    def ensure_trained(self, model_path: Optional[str] = MODEL_PATH):
+        """Load the saved models, or train and save them; concurrent callers wait for the same run"""
+        with self._train_lock:
+            if self.is_trained:
+                return
+            if model_path and os.path.exists(model_path):
+                try:
+                    self.load_model(model_path)
+                except Exception as e:
+                    print(f"⚠️ Could not load saved model ({e}), training a new one")
+            if not self.is_trained:
+                self.train_models()
+                if model_path:
+                    try:
+                        self.save_model(model_path)
+                    except OSError as e:
+                        # A read-only filesystem only costs the next boot a retrain
+                        print(f"⚠️ Could not save model to {model_path}: {e}")
         
     def extract_features_from_startup_data(self, startup_data: Dict[str, Any]) -> StartupFeatures:
         """
@@ -242,16 +268,25 @@ class StartupSuccessPredictor:
         # Calculate feature importance
         rf_model = best_models['RandomForest']
         self.feature_importance = dict(zip(feature_columns, rf_model.feature_importances_))
+        self.key_factors = self._top_factors()
         
         print("🎯 Model training completed!")
         return best_models
     
+    def _top_factors(self, n: int = 5) -> List[Tuple[str, float]]:
+        """Most important features; fixed once the models are trained, so computed then"""
+        return sorted(
+            [(feature, float(importance)) for feature, importance in self.feature_importance.items()],
+            key=lambda x: x[1],
+            reverse=True
+        )[:n]
+    
     def predict_success(self, startup_data: Dict[str, Any]) -> PredictionResult:
         """
         Predict startup success probability
         """
         if not self.is_trained:
-            self.train_models()
+            self.ensure_trained()
         
         # Extract features
         features = self.extract_features_from_startup_data(startup_data)
@@ -294,9 +329,9 @@ class StartupSuccessPredictor:
         probabilities = {}
         
         for name, model in self.models.items():
-            pred = model.predict(feature_vector_scaled)[0]
+            # predict() is the argmax of predict_proba(), so one pass through the model gives both
             prob = model.predict_proba(feature_vector_scaled)[0]
-            predictions[name] = pred
+            predictions[name] = model.classes_[prob.argmax()]
             probabilities[name] = prob[1] if len(prob) > 1 else prob[0]
         
         # Use Random Forest as primary model (best accuracy in reference)
@@ -308,18 +343,12 @@ class StartupSuccessPredictor:
         model_agreement = sum(predictions.values()) / len(predictions)
         confidence = abs(model_agreement - 0.5) * 2  # Convert to 0-1 scale
         
-        # Get key factors
-        key_factors = sorted(
-            [(feature, importance) for feature, importance in self.feature_importance.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-        
+        # Plain floats so the response serializes without numpy handling
         return PredictionResult(
-            success_probability=success_probability,
+            success_probability=float(success_probability),
             prediction=prediction,
-            confidence=confidence,
-            key_factors=key_factors,
+            confidence=float(confidence),
+            key_factors=self.key_factors,
             model_accuracy=0.85
         )
     
@@ -332,7 +361,13 @@ class StartupSuccessPredictor:
             'feature_importance': self.feature_importance,
             'is_trained': self.is_trained
         }
-        joblib.dump(model_data, filepath)
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Written aside and renamed, so a worker loading it never sees a partial file
+        tmp_path = f"{filepath}.tmp.{os.getpid()}"
+        joblib.dump(model_data, tmp_path)
+        os.replace(tmp_path, filepath)
         print(f"💾 Model saved to {filepath}")
     
     def load_model(self, filepath: str):
@@ -344,6 +379,7 @@ class StartupSuccessPredictor:
             self.scaler = model_data['scaler']
             self.feature_importance = model_data['feature_importance']
             self.is_trained = model_data['is_trained']
+            self.key_factors = self._top_factors()
             print(f"📂 Model loaded from {filepath}")
         else:
             print("⚠️ Model file not found, will train new model")
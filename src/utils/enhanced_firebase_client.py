@@ -3,15 +3,22 @@ Enhanced Firebase client with real-time collaboration and fixed authentication
 """
 import firebase_admin
 from firebase_admin import credentials, firestore, auth
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
+import copy
 import json
 import time
 import logging
 import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Sessions whose latest state this process knows because it wrote it
+MAX_CACHED_SESSIONS = 256
+
 class EnhancedFirebaseClient:
     """Enhanced Firebase client with real-time collaboration features"""
     
@@ -20,6 +27,8 @@ class EnhancedFirebaseClient:
         self.db = None
         self.auth = None
         self.initialized = False
+        self._session_cache = OrderedDict()
+        self._session_lock = threading.Lock()
         
         try:
             # Initialize Firebase Admin SDK with service account
@@ -106,6 +115,7 @@ class EnhancedFirebaseClient:
             
             doc_ref = self.db.collection('analysis_sessions').document(startup_id)
             doc_ref.set(session_data)
+            self._cache_session(startup_id, session_data)
             
             logger.info(f"✅ Analysis session created for startup: {startup_id}")
             return True
@@ -114,6 +124,28 @@ class EnhancedFirebaseClient:
             logger.error(f"❌ Failed to create analysis session: {str(e)}")
             return False
     
+    def _progress_update_data(self, agent_name: str, progress: int, results: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Session fields written for one progress update"""
+        update_data = {
+            'progress': progress,
+            'current_agent': agent_name,
+            'updated_at': firestore.SERVER_TIMESTAMP,
+            'last_activity': time.time()
+        }
+        
+        # Add agent to completed list if progress indicates completion
+        if progress >= 100:
+            update_data['status'] = 'completed'
+            update_data['current_agent'] = None
+        elif agent_name:
+            update_data[f'agents_completed'] = firestore.ArrayUnion([agent_name])
+        
+        # Add results if provided
+        if results:
+            update_data[f'results.{agent_name}'] = results
+        
+        return update_data
+    
     def update_real_time_progress(self, startup_id: str, agent_name: str, progress: int, results: Dict[str, Any] = None) -> bool:
         """Update analysis progress in real-time"""
         try:
@@ -121,26 +153,11 @@ class EnhancedFirebaseClient:
                 logger.warning("Firebase not available, skipping progress update")
                 return False
             
-            update_data = {
-                'progress': progress,
-                'current_agent': agent_name,
-                'updated_at': firestore.SERVER_TIMESTAMP,
-                'last_activity': time.time()
-            }
-            
-            # Add agent to completed list if progress indicates completion
-            if progress >= 100:
-                update_data['status'] = 'completed'
-                update_data['current_agent'] = None
-            elif agent_name:
-                update_data[f'agents_completed'] = firestore.ArrayUnion([agent_name])
-            
-            # Add results if provided
-            if results:
-                update_data[f'results.{agent_name}'] = results
+            update_data = self._progress_update_data(agent_name, progress, results)
             
             doc_ref = self.db.collection('analysis_sessions').document(startup_id)
             doc_ref.update(update_data)
+            self._apply_to_cached_session(startup_id, update_data)
             
             logger.info(f"✅ Progress updated: {startup_id} - {agent_name} ({progress}%)")
             return True
@@ -149,16 +166,51 @@ class EnhancedFirebaseClient:
             logger.error(f"❌ Failed to update progress: {str(e)}")
             return False
     
-    def get_analysis_session(self, startup_id: str) -> Optional[Dict[str, Any]]:
-        """Get current analysis session data"""
+    def update_real_time_progress_batch(self, startup_id: str, steps: List[Tuple[str, int, Optional[Dict[str, Any]]]]) -> bool:
+        """Apply several (agent_name, progress, results) updates in one batched write"""
+        try:
+            if not self.initialized:
+                logger.warning("Firebase not available, skipping progress update")
+                return False
+            
+            doc_ref = self.db.collection('analysis_sessions').document(startup_id)
+            batch = self.db.batch()
+            updates = [self._progress_update_data(agent_name, progress, results) for agent_name, progress, results in steps]
+            for update_data in updates:
+                batch.update(doc_ref, update_data)
+            batch.commit()
+            for update_data in updates:
+                self._apply_to_cached_session(startup_id, update_data)
+            
+            logger.info(f"✅ Progress updated: {startup_id} - {len(steps)} steps in one batch")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to update progress: {str(e)}")
+            return False
+    
+    def get_analysis_session(self, startup_id: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Get current analysis session data
+        
+        Sessions written by this process are answered from memory; pass
+        force_refresh=True to read what Firestore holds, e.g. after another
+        process may have changed the session.
+        """
         try:
             if not self.initialized:
                 return None
             
+            if not force_refresh:
+                with self._session_lock:
+                    if startup_id in self._session_cache:
+                        self._session_cache.move_to_end(startup_id)
+                        return copy.deepcopy(self._session_cache[startup_id])
+            
             doc_ref = self.db.collection('analysis_sessions').document(startup_id)
             doc = doc_ref.get()
             
             if doc.exists:
+                # Not cached: a session read here may still be advancing in another process
                 return doc.to_dict()
             else:
                 return None
@@ -212,11 +264,13 @@ class EnhancedFirebaseClient:
             
             # Update session status
             session_ref = self.db.collection('analysis_sessions').document(startup_id)
-            session_ref.update({
+            session_update = {
                 'status': 'completed',
                 'completed_at': firestore.SERVER_TIMESTAMP,
                 'final_results': complete_analysis
-            })
+            }
+            session_ref.update(session_update)
+            self._apply_to_cached_session(startup_id, session_update)
             
             logger.info(f"✅ Final analysis stored for startup: {startup_id}")
             return True
@@ -264,10 +318,12 @@ class EnhancedFirebaseClient:
                 return False
             
             doc_ref = self.db.collection('analysis_sessions').document(startup_id)
-            doc_ref.update({
+            session_update = {
                 'collaboration.active_users': firestore.ArrayUnion([user_id]),
                 'collaboration.last_joined': time.time()
-            })
+            }
+            doc_ref.update(session_update)
+            self._apply_to_cached_session(startup_id, session_update)
             
             logger.info(f"✅ User {user_id} added to session {startup_id}")
             return True
@@ -327,6 +383,40 @@ class EnhancedFirebaseClient:
             }
         ]
     
+    def _cache_session(self, startup_id: str, session_data: Dict[str, Any]):
+        """Remember a session's full state, resolving write sentinels locally"""
+        cached = {field: self._local_value(None, value) for field, value in session_data.items()}
+        with self._session_lock:
+            self._session_cache[startup_id] = cached
+            self._session_cache.move_to_end(startup_id)
+            while len(self._session_cache) > MAX_CACHED_SESSIONS:
+                self._session_cache.popitem(last=False)
+    
+    def _apply_to_cached_session(self, startup_id: str, update_data: Dict[str, Any]):
+        """Mirror a Firestore update() onto the cached session, if there is one"""
+        with self._session_lock:
+            session = self._session_cache.get(startup_id)
+            if session is None:
+                return
+            for path, value in update_data.items():
+                # Dotted field paths address nested maps, as they do in update()
+                *parents, field = path.split('.')
+                target = session
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[field] = self._local_value(target.get(field), value)
+    
+    @staticmethod
+    def _local_value(current: Any, value: Any) -> Any:
+        """What Firestore will store for a written value"""
+        if value is firestore.SERVER_TIMESTAMP:
+            return datetime.now(timezone.utc)
+        if isinstance(value, firestore.ArrayUnion):
+            merged = list(current or [])
+            merged.extend(item for item in value.values if item not in merged)
+            return merged
+        return copy.deepcopy(value)
+    
     def is_available(self) -> bool:
         """Check if Firebase is available and initialized"""
         return self.initialized and self.db is not None
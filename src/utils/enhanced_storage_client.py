@@ -1,17 +1,32 @@
 """
 Enhanced Google Cloud Storage client with file upload and processing capabilities
 """
+import io
 import os
 import time
+import base64
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Dict, Any, Optional, List, BinaryIO
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from google.api_core import exceptions
 import mimetypes
-import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Resumable upload chunk size; must be a multiple of 256 KB
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Each streamed upload holds up to one UPLOAD_CHUNK_SIZE chunk in memory; capping
+# how many run at once bounds that to MAX_CONCURRENT_UPLOADS chunks
+MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", "4"))
+_upload_slots = threading.BoundedSemaphore(MAX_CONCURRENT_UPLOADS)
+
+# Files on disk at least this large go up as concurrent XML multipart parts
+PARALLEL_UPLOAD_THRESHOLD = 20 * 1024 * 1024
+PARALLEL_UPLOAD_WORKERS = 8
+
 class EnhancedStorageClient:
     """Enhanced Google Cloud Storage client with comprehensive file handling"""
     
@@ -74,6 +89,26 @@ class EnhancedStorageClient:
     def upload_startup_file(self, file_data: bytes, filename: str, startup_id: str, 
                            content_type: Optional[str] = None) -> Dict[str, Any]:
         """Upload file for a specific startup"""
+        return self.upload_stream(
+            io.BytesIO(file_data), filename, startup_id=startup_id,
+            content_type=content_type, size_hint=len(file_data)
+        )
+    
+    def upload_demo_file(self, file_data: bytes, filename: str, 
+                        file_type: str = "document") -> Dict[str, Any]:
+        """Upload demo file for testing and demonstrations"""
+        return self.upload_stream(
+            io.BytesIO(file_data), filename, file_type=file_type, size_hint=len(file_data)
+        )
+    
+    def upload_stream(self, fileobj: BinaryIO, filename: str, startup_id: Optional[str] = None,
+                      content_type: Optional[str] = None, size_hint: Optional[int] = None,
+                      file_type: str = "document") -> Dict[str, Any]:
+        """Upload from a file object in chunks so large files never sit fully in memory
+        
+        Files with a startup_id go under startups/, everything else under demo/.
+        This call blocks; run it with asyncio.to_thread from async code.
+        """
         if not self.initialized:
             raise Exception("Cloud Storage not initialized")
         
@@ -81,7 +116,10 @@ class EnhancedStorageClient:
             # Generate safe filename with timestamp
             timestamp = int(time.time())
             safe_filename = self._sanitize_filename(filename)
-            blob_name = f"startups/{startup_id}/{timestamp}_{safe_filename}"
+            if startup_id:
+                blob_name = f"startups/{startup_id}/{timestamp}_{safe_filename}"
+            else:
+                blob_name = f"demo/{file_type}/{timestamp}_{safe_filename}"
             
             # Detect content type if not provided
             if not content_type:
@@ -89,18 +127,41 @@ class EnhancedStorageClient:
                 if not content_type:
                     content_type = 'application/octet-stream'
             
-            # Create blob and upload
-            blob = self.bucket.blob(blob_name)
+            # Create blob and upload. Up to 8 MB with a known size is one multipart
+            # request; larger streams go up as resumable 8 MB PUTs, and large files
+            # on disk as parallel parts
+            blob = self.bucket.blob(blob_name, chunk_size=UPLOAD_CHUNK_SIZE)
             blob.content_type = content_type
-            
-            # Upload file data
-            blob.upload_from_string(file_data)
+            path = getattr(fileobj, "name", None)
+            if size_hint and size_hint >= PARALLEL_UPLOAD_THRESHOLD and isinstance(path, str) and os.path.isfile(path):
+                transfer_manager.upload_chunks_concurrently(
+                    path, blob, content_type=content_type, chunk_size=UPLOAD_CHUNK_SIZE,
+                    worker_type=transfer_manager.THREAD, max_workers=PARALLEL_UPLOAD_WORKERS
+                )
+                # The parts are assembled server side; fetch the final object's size
+                blob.reload()
+            else:
+                with _upload_slots:
+                    blob.upload_from_file(fileobj, content_type=content_type, size=size_hint, checksum="crc32c")
             
             # Make blob publicly readable
             blob.make_public()
             
-            # Generate file hash for integrity
-            file_hash = hashlib.md5(file_data).hexdigest()
+            # GCS computes size and MD5 server side, so the data is never re-read here
+            size = blob.size if blob.size is not None else (size_hint or 0)
+            file_hash = base64.b64decode(blob.md5_hash).hex() if blob.md5_hash else None
+            
+            if not startup_id:
+                logger.info(f"✅ Demo file uploaded: {filename}")
+                return {
+                    'success': True,
+                    'public_url': blob.public_url,
+                    'storage_path': blob_name,
+                    'size': size,
+                    'content_type': content_type,
+                    'timestamp': timestamp,
+                    'file_type': file_type
+                }
             
             # Set metadata
             blob.metadata = {
@@ -117,63 +178,24 @@ class EnhancedStorageClient:
                 'public_url': blob.public_url,
                 'storage_path': blob_name,
                 'bucket': self.bucket_name,
-                'size': len(file_data),
+                'size': size,
                 'content_type': content_type,
                 'file_hash': file_hash,
                 'timestamp': timestamp,
                 'metadata': {
                     'startup_id': startup_id,
                     'original_filename': filename,
-                    'size_mb': round(len(file_data) / (1024 * 1024), 2)
+                    'size_mb': round(size / (1024 * 1024), 2)
                 }
             }
             
-            logger.info(f"✅ File uploaded successfully: {filename} ({len(file_data)} bytes)")
+            logger.info(f"✅ File uploaded successfully: {filename} ({size} bytes)")
             return result
             
         except Exception as e:
             logger.error(f"❌ File upload failed: {str(e)}")
             raise Exception(f"File upload failed: {str(e)}")
     
-    def upload_demo_file(self, file_data: bytes, filename: str, 
-                        file_type: str = "document") -> Dict[str, Any]:
-        """Upload demo file for testing and demonstrations"""
-        if not self.initialized:
-            raise Exception("Cloud Storage not initialized")
-        
-        try:
-            timestamp = int(time.time())
-            safe_filename = self._sanitize_filename(filename)
-            blob_name = f"demo/{file_type}/{timestamp}_{safe_filename}"
-            
-            # Detect content type
-            content_type, _ = mimetypes.guess_type(filename)
-            if not content_type:
-                content_type = 'application/octet-stream'
-            
-            # Create and upload blob
-            blob = self.bucket.blob(blob_name)
-            blob.content_type = content_type
-            blob.upload_from_string(file_data)
-            blob.make_public()
-            
-            result = {
-                'success': True,
-                'public_url': blob.public_url,
-                'storage_path': blob_name,
-                'size': len(file_data),
-                'content_type': content_type,
-                'timestamp': timestamp,
-                'file_type': file_type
-            }
-            
-            logger.info(f"✅ Demo file uploaded: {filename}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"❌ Demo file upload failed: {str(e)}")
-            raise Exception(f"Demo file upload failed: {str(e)}")
-    
     def list_startup_files(self, startup_id: str) -> List[Dict[str, Any]]:
         """List all files for a specific startup"""
         if not self.initialized:
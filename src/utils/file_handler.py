@@ -24,8 +24,9 @@ def load_file(uploaded_file):
 
 
 def extract_text_from_pdf(uploaded_file):
-    text = ""
+    pages = []
     with pdfplumber.open(uploaded_file) as pdf:
         for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text.strip()
+            pages.append(page.extract_text() or "")
+            page.flush_cache()
+    return "".join(pages).strip()
@@ -32,9 +32,16 @@ qa_pipeline = pipeline(
 )
 
 # ----------- SUMMARY FUNCTION ------------
+MAX_CELL_CHARS = 200
+
 def summarize_report(data):
     if isinstance(data, pd.DataFrame):
-        text = data.head(10).to_csv(index=False)
+        # Only the first rows are summarized; long text cells are cut so they
+        # can't crowd the rest of the table out of the model's input
+        preview = data.head(10).copy()
+        for column in preview.select_dtypes("object").columns:
+            preview[column] = preview[column].map(lambda value: value[:MAX_CELL_CHARS] if isinstance(value, str) else value)
+        text = preview.to_csv(index=False)
     elif isinstance(data, str):
         text = data[:1000]
     else:
@@ -5,6 +5,8 @@ Extracts text content from PDF files for AI agent analysis
 
 import os
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple
 import PyPDF2
 import pdfplumber
@@ -13,6 +15,50 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Layout analysis is CPU-bound, so decks with at least this many pages are
+# split into page ranges that worker processes extract side by side
+PARALLEL_EXTRACTION_MIN_PAGES = 20
+# Every server worker runs its own pool, so the cores are shared out among them
+PDF_WORKERS = max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1")))
+
+# Started and stopped by the app's lifespan; without it decks are extracted in-process
+_page_pool = None
+
+def start_page_pool():
+    """Start the extraction worker processes; call once at app startup"""
+    global _page_pool
+    if _page_pool is None and PDF_WORKERS > 1:
+        # spawn rather than fork: forking a process that already runs threads
+        # can copy locks another thread holds and deadlock the child
+        _page_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def shutdown_page_pool():
+    """Stop the extraction worker processes, dropping extractions not yet started"""
+    global _page_pool
+    if _page_pool is not None:
+        _page_pool.shutdown(cancel_futures=True)
+        _page_pool = None
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[Optional[str]]:
+    """Text of pages [start, stop) of a PDF; runs in a worker process"""
+    texts = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            texts.append(page.extract_text())
+            page.flush_cache()
+    return texts
+
+def _extract_pages_in_parallel(file_path: str, page_count: int) -> List[Optional[str]]:
+    """Text of the first page_count pages, extracted across the page pool's processes"""
+    # One contiguous range per worker, so each process opens the file once
+    step = -(-page_count // PDF_WORKERS)
+    starts = range(0, page_count, step)
+    stops = [min(start + step, page_count) for start in starts]
+    texts = []
+    for chunk in _page_pool.map(_extract_page_range, [file_path] * len(starts), starts, stops):
+        texts.extend(chunk)
+    return texts
+
 class PDFProcessor:
     """Handles PDF text extraction and content processing"""
     
@@ -94,10 +140,12 @@ class PDFProcessor:
                 # Process pages (limit to max_pages)
                 pages_to_process = min(len(pdf.pages), self.max_pages)
                 
-                for page_num in range(pages_to_process):
-                    page = pdf.pages[page_num]
-                    page_text = page.extract_text()
-                    
+                if pages_to_process >= PARALLEL_EXTRACTION_MIN_PAGES and _page_pool is not None:
+                    extracted_pages = _extract_pages_in_parallel(file_path, pages_to_process)
+                else:
+                    extracted_pages = [pdf.pages[page_num].extract_text() for page_num in range(pages_to_process)]
+                
+                for page_num, page_text in enumerate(extracted_pages):
                     if page_text and page_text.strip():
                         text_content.append(page_text)
                         page_texts.append({
@@ -219,7 +219,7 @@ def test_startup_analysis():
                 google_services.store_analysis_result("test_startup", {
                     "analysis": analysis,
                     "ai_service": ai_service,
-                    "startup_data": test_startup.dict()
+                    "startup_data": test_startup.model_dump(mode="json")
                 }, "test_user")
                 print("✅ Results stored in Firebase")
             except Exception as e:
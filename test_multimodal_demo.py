@@ -285,14 +285,5 @@ if __name__ == "__main__":
             print(f"❌ Demo failed: {str(e)}")
             sys.exit(1)
     
-    # Install python-dotenv if needed
-    try:
-        from dotenv import load_dotenv
-    except ImportError:
-        print("Installing python-dotenv...")
-        import os
-        os.system("pip3 install python-dotenv")
-        from dotenv import load_dotenv
-    
     # Run the demo
     asyncio.run(main())
@@ -6,12 +6,23 @@ Integrates startup analysis with Smart Report Analyzer features
 
 import os
 import sys
+import json
 import time
+import hashlib
+import secrets
+import tempfile
+import threading
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import orjson
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 
 # Add current directory to Python path
@@ -20,17 +31,109 @@ sys.path.append('/Users/sanjay/google')
 sys.path.append('src')
 
 # Import ML predictor
-from ml.startup_success_predictor import predict_startup_success, PredictionResult
+from ml.startup_success_predictor import predict_startup_success, startup_predictor, PredictionResult
 
 # Import PDF processor
-from src.utils.pdf_processor import pdf_processor
+from src.utils.pdf_processor import pdf_processor, shutdown_page_pool, start_page_pool
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+class JSONLogFormatter(logging.Formatter):
+    """One orjson-encoded object per line, ready for log shipping"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+class HealthCheckAccessFilter(logging.Filter):
+    """Drop access-log lines for the health probe, which platforms poll continuously"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn passes (client, method, path, http_version, status) as the record args
+        return not (isinstance(record.args, tuple) and len(record.args) > 2 and record.args[2] == "/api/health")
+
+_log_handler = logging.StreamHandler()
+if not os.getenv("DEV"):
+    _log_handler.setFormatter(JSONLogFormatter())
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
+logging.getLogger("uvicorn.access").addFilter(HealthCheckAccessFilter())
 logger = logging.getLogger(__name__)
 
+# Processes started with spawn (the PDF page pool, uvicorn's extra workers) re-run
+# this file as __mp_main__ only so pickled references resolve. They never serve
+# it, so the models, clients and executors below are set up only when serving
+SERVING_PROCESS = __name__ != "__mp_main__"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the saved success predictor in the background so the first prediction is fast
+    and startup is not held up; predictions that arrive early wait for this run"""
+    app.state.ml_warm_up = asyncio.get_running_loop().run_in_executor(ML_EXECUTOR, startup_predictor.ensure_trained)
+    app.state.ml_warm_up.add_done_callback(_log_warm_up_failure)
+    start_page_pool()
+    yield
+    ML_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    await asyncio.to_thread(shutdown_page_pool)
+
+def _log_warm_up_failure(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"⚠️ ML warm-up failed, models will load or train on first prediction: {future.exception()}")
+
 # Initialize FastAPI app
-app = FastAPI(title="Enhanced Startup Analyst Platform", version="2.0.0")
+# orjson renders the nested agent findings and numpy scores much faster than json
+app = FastAPI(title="Enhanced Startup Analyst Platform", version="2.0.0",
+              default_response_class=ORJSONResponse, lifespan=lifespan)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "100")) * 1024 * 1024
+
+def _upload_too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit")
+
+class UploadSizeLimitMiddleware:
+    """Reject request bodies over MAX_UPLOAD_BYTES as they arrive
+    
+    FastAPI reads and spools a whole multipart body before a handler runs, so
+    the limit has to be enforced here: from Content-Length when the client sends
+    it, and by counting the received chunks when it is absent or understated.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+            response = ORJSONResponse({"detail": _upload_too_large().detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > MAX_UPLOAD_BYTES:
+                    # FastAPI re-raises HTTPExceptions from body parsing, so this becomes a 413
+                    raise _upload_too_large()
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+# Added before CORS so CORS wraps it and browsers can read its 413
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -42,28 +145,112 @@ app.add_middleware(
 )
 
 # Import working components
-try:
-    from agents.startup_analyst_agents import StartupAnalystOrchestrator, StartupData
-    orchestrator = StartupAnalystOrchestrator()
-    STARTUP_ANALYSIS_AVAILABLE = True
-    logger.info("✅ Startup Analysis available")
-except Exception as e:
-    STARTUP_ANALYSIS_AVAILABLE = False
-    logger.warning(f"⚠️ Startup Analysis not available: {e}")
+if SERVING_PROCESS:
+    try:
+        from agents.startup_analyst_agents import StartupAnalystOrchestrator, StartupData
+        orchestrator = StartupAnalystOrchestrator()
+        STARTUP_ANALYSIS_AVAILABLE = True
+        logger.info("✅ Startup Analysis available")
+    except Exception as e:
+        STARTUP_ANALYSIS_AVAILABLE = False
+        logger.warning(f"⚠️ Startup Analysis not available: {e}")
+
+# CPU-bound ML and PDF work runs here so it neither blocks the event loop nor
+# starts an unbounded number of threads under concurrent requests
+if SERVING_PROCESS:
+    ML_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="ml")
+
+async def run_ml(fn, *args):
+    """Run a blocking ML/PDF call on ML_EXECUTOR"""
+    return await asyncio.get_running_loop().run_in_executor(ML_EXECUTOR, fn, *args)
+
+# Each document job holds a whole file (and possibly a DataFrame) in memory;
+# extra requests wait for a slot instead of all loading at once
+DOCUMENT_CONCURRENCY = int(os.getenv("DOCUMENT_CONCURRENCY", max(1, (os.cpu_count() or 2) // 2)))
+document_slots = asyncio.Semaphore(DOCUMENT_CONCURRENCY)
 
-# Store analysis results in memory (in production, use a database)
-analysis_results = {}
+async def run_document_job(fn, *args):
+    """Run a blocking document helper in a thread, at most DOCUMENT_CONCURRENCY at a time"""
+    async with document_slots:
+        return await asyncio.to_thread(fn, *args)
 
-# Import Smart Report Analyzer utilities
+# Optional Redis backend so stored results are shared by every worker and survive restarts
 try:
-    from src.utils.file_handler import load_file
-    from src.utils.llm_agent import summarize_report, ask_question
-    from src.utils.eda import generate_eda_report
-    SMART_ANALYZER_AVAILABLE = True
-    logger.info("✅ Smart Report Analyzer available")
-except ImportError as e:
-    SMART_ANALYZER_AVAILABLE = False
-    logger.warning(f"⚠️ Smart Analyzer not available: {e}")
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+ANALYSIS_RESULT_TTL_SECONDS = 86400
+
+class AnalysisResultStore:
+    """Results by id, in Redis when REDIS_URL is set and in process memory otherwise"""
+    
+    def __init__(self, redis_url: Optional[str] = None, ttl: int = ANALYSIS_RESULT_TTL_SECONDS,
+                 prefix: str = "analysis", max_memory_items: int = 1000):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.max_memory_items = max_memory_items
+        # Only the most recent entries are kept without Redis, so memory stays bounded
+        self._memory = OrderedDict()
+        self._redis = None
+        if redis_url:
+            if REDIS_AVAILABLE:
+                self._redis = aioredis.from_url(redis_url)
+            else:
+                logger.warning("⚠️ REDIS_URL is set but the redis package is not installed; keeping results in memory")
+    
+    @property
+    def shared(self) -> bool:
+        """Whether results are visible across processes"""
+        return self._redis is not None
+    
+    async def set(self, startup_id: str, value: Dict[str, Any]):
+        if self._redis is not None:
+            await self._redis.set(f"{self.prefix}:{startup_id}", json.dumps(value, default=str), ex=self.ttl)
+        else:
+            self._memory[startup_id] = value
+            self._memory.move_to_end(startup_id)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+    
+    async def get(self, startup_id: str) -> Optional[Dict[str, Any]]:
+        if self._redis is not None:
+            raw = await self._redis.get(f"{self.prefix}:{startup_id}")
+            return json.loads(raw) if raw is not None else None
+        return self._memory.get(startup_id)
+
+# The predictor trains on seeded synthetic data, so identical inputs always
+# score the same; completed predictions are reused by input hash
+PREDICTION_CACHE_TTL_SECONDS = 3600
+
+if SERVING_PROCESS:
+    # Store analysis results for the progress endpoint
+    analysis_results = AnalysisResultStore(os.getenv("REDIS_URL"))
+    prediction_cache = AnalysisResultStore(os.getenv("REDIS_URL"), ttl=PREDICTION_CACHE_TTL_SECONDS, prefix="prediction")
+    # Extracted pitch deck text by PDF content hash; uploads of the same deck skip extraction
+    pdf_content_cache = AnalysisResultStore(os.getenv("REDIS_URL"), prefix="pdf_content", max_memory_items=64)
+
+# Completed results are revalidated with an ETag so repeat polls get an empty 304
+COMPLETED_RESULT_CACHE_CONTROL = "private, max-age=60, must-revalidate"
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+def prediction_cache_key(startup_data: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(startup_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+# Import Smart Report Analyzer utilities; llm_agent loads its Hugging Face pipelines on import
+if SERVING_PROCESS:
+    try:
+        from src.utils.file_handler import load_file
+        from src.utils.llm_agent import summarize_report, ask_question
+        from src.utils.eda import generate_eda_report
+        SMART_ANALYZER_AVAILABLE = True
+        logger.info("✅ Smart Report Analyzer available")
+    except ImportError as e:
+        SMART_ANALYZER_AVAILABLE = False
+        logger.warning(f"⚠️ Smart Analyzer not available: {e}")
 
 # Pydantic models
 class StartupInput(BaseModel):
@@ -105,6 +292,27 @@ async def get_status():
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
     }
 
+def build_startup_data(startup_input: StartupInput) -> "StartupData":
+    """StartupData for the agents, with any extracted pitch deck text appended to the description"""
+    payload = startup_input.model_dump(include=StartupData.INPUT_FIELDS)
+    pdf_content = startup_input.pdf_content
+    
+    if pdf_content and pdf_content.get('success'):
+        parts = [
+            payload["business_description"],
+            "\n\n--- PITCH DECK CONTENT ---\n",
+            f"Full pitch deck text ({pdf_content.get('word_count', 0)} words, {pdf_content.get('page_count', 0)} pages):\n\n",
+            pdf_content.get('text', '')
+        ]
+        # Add structured sections if available
+        pdf_sections = pdf_content.get('sections', {})
+        if pdf_sections:
+            parts.append("\n\n--- STRUCTURED SECTIONS ---\n")
+            parts.extend(f"\n{name.upper()}:\n{content}\n" for name, content in pdf_sections.items())
+        payload["business_description"] = "".join(parts)
+    
+    return StartupData.from_input(payload)
+
 @app.post("/api/analyze")
 async def analyze_startup(startup_input: StartupInput):
     """Analyze a startup using AI agents"""
@@ -114,38 +322,10 @@ async def analyze_startup(startup_input: StartupInput):
     try:
         logger.info(f"Starting analysis for {startup_input.company_name}")
         
-        # Enhance business description with PDF content if available
-        enhanced_description = startup_input.business_description
-        
-        if startup_input.pdf_content and startup_input.pdf_content.get('success'):
-            pdf_text = startup_input.pdf_content.get('text', '')
-            pdf_sections = startup_input.pdf_content.get('sections', {})
-            
-            # Add PDF content to business description
-            enhanced_description += f"\n\n--- PITCH DECK CONTENT ---\n"
-            enhanced_description += f"Full pitch deck text ({startup_input.pdf_content.get('word_count', 0)} words, {startup_input.pdf_content.get('page_count', 0)} pages):\n\n"
-            enhanced_description += pdf_text
-            
-            # Add structured sections if available
-            if pdf_sections:
-                enhanced_description += f"\n\n--- STRUCTURED SECTIONS ---\n"
-                for section_name, section_content in pdf_sections.items():
-                    enhanced_description += f"\n{section_name.upper()}:\n{section_content}\n"
-        
-        # Convert to StartupData format
-        startup_data = StartupData(
-            company_name=startup_input.company_name,
-            founder_name=startup_input.founder_name or "Unknown",
-            business_description=enhanced_description,
-            pitch_deck_url=startup_input.pitch_deck_url,
-            website_url=startup_input.website,
-            industry=startup_input.industry,
-            funding_stage=startup_input.stage,
-            team_size=None
-        )
+        startup_data = build_startup_data(startup_input)
         
         # Run analysis
-        results = orchestrator.analyze_startup(startup_data)
+        results = await orchestrator.aanalyze_startup(startup_data)
         
         # Convert results to frontend-expected format
         frontend_results = {
@@ -166,12 +346,13 @@ async def analyze_startup(startup_input: StartupInput):
                 "analysis_type": result.analysis_type,
                 "findings": result.findings,
                 "confidence_score": result.confidence_score,
-                "timestamp": result.timestamp.isoformat()
+                "timestamp": result.iso_timestamp
             }
         
-        # Store results for progress endpoint
-        startup_id = f"{startup_input.company_name.lower().replace(' ', '_')}_{int(time.time() * 1000)}"
-        analysis_results[startup_id] = {
+        # Store results for progress endpoint; random ids cannot collide when the
+        # same company is analysed twice at once
+        startup_id = secrets.token_urlsafe(12)
+        stored_data = {
             "results": frontend_results,
             "status": "completed",
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
@@ -265,11 +446,17 @@ async def analyze_startup(startup_input: StartupInput):
                 'model_accuracy': 0.85,
                 'error': 'ML prediction unavailable'
             }
+        
+        # Results never change once stored, so their validator is computed once here
+        stored_data["updated_at"] = int(time.time() * 1000)
+        stored_data["etag"] = _etag(orjson.dumps(frontend_results, option=orjson.OPT_SERIALIZE_NUMPY, default=str))
+        await analysis_results.set(startup_id, stored_data)
 
         return {
             "status": "success",
             "results": frontend_results,
             "startup_id": startup_id,
+            "company_name": startup_input.company_name,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "analysis_time": "10.0 seconds"
         }
@@ -278,50 +465,115 @@ async def analyze_startup(startup_input: StartupInput):
         logger.error(f"Analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+def _save_upload(upload: UploadFile, path: str) -> Tuple[int, str]:
+    """Copy an upload to disk in chunks instead of reading it into memory; returns its size and SHA-256"""
+    size = 0
+    digest = hashlib.sha256()
+    with open(path, "wb") as buffer:
+        # UploadSizeLimitMiddleware already bounds the body; this also bounds the file part
+        while chunk := upload.file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                break
+            digest.update(chunk)
+            buffer.write(chunk)
+    if size > MAX_UPLOAD_BYTES:
+        os.remove(path)
+        raise _upload_too_large()
+    return size, digest.hexdigest()
+
+# Parsed uploads by content hash, so sending the same file again skips pandas and
+# pdfplumber. Kept per process and small, since a loaded DataFrame can be large
+LOADED_DOCUMENT_CACHE_SIZE = 16
+_loaded_documents = OrderedDict()
+_loaded_documents_lock = threading.Lock()
+
+def _load_document(path: str, content_hash: str):
+    """load_file, reusing the result for content seen before"""
+    # load_file picks the parser by extension, so the same bytes under another type are another entry
+    key = (content_hash, os.path.splitext(path)[1].lower())
+    with _loaded_documents_lock:
+        if key in _loaded_documents:
+            _loaded_documents.move_to_end(key)
+            return _loaded_documents[key]
+    
+    loaded = load_file(path)
+    with _loaded_documents_lock:
+        _loaded_documents[key] = loaded
+        while len(_loaded_documents) > LOADED_DOCUMENT_CACHE_SIZE:
+            _loaded_documents.popitem(last=False)
+    return loaded
+
+def _new_temp_path(filename: str) -> str:
+    """Create an empty private temp file, keeping the upload's extension for load_file"""
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(os.path.basename(filename or ""))[1])
+    os.close(fd)
+    return path
+
+def _remove_temp_file(path: str):
+    # _save_upload already deletes rejected oversize uploads
+    if os.path.exists(path):
+        os.remove(path)
+
+def _analyze_document_file(temp_path: str, content_hash: str, filename: str, analysis_type: str) -> Dict[str, Any]:
+    """Load a saved upload and summarize it"""
+    df, raw_text = _load_document(temp_path, content_hash)
+    
+    result = {
+        "filename": filename,
+        "analysis_type": analysis_type,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+    
+    if df is not None:
+        # Structured data analysis
+        result["data_preview"] = df.head().to_dict()
+        result["summary"] = summarize_report(df)
+        result["data_type"] = "structured"
+        
+    elif raw_text:
+        # PDF/text analysis
+        result["text_preview"] = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
+        result["summary"] = summarize_report(raw_text)
+        result["data_type"] = "unstructured"
+    
+    return result
+
+def _answer_document_question(temp_path: str, content_hash: str, question: str) -> str:
+    """Load a saved upload and answer a question about it"""
+    df, raw_text = _load_document(temp_path, content_hash)
+    
+    if df is not None:
+        return ask_question(df, question)
+    elif raw_text:
+        return ask_question(raw_text, question)
+    return "Could not process the uploaded file."
+
 @app.post("/api/analyze-document")
 async def analyze_document(file: UploadFile = File(...), analysis_type: str = "pitch_deck"):
     """Analyze uploaded documents using Smart Report Analyzer"""
     if not SMART_ANALYZER_AVAILABLE:
         raise HTTPException(status_code=503, detail="Smart Analyzer not available")
-    
     try:
         logger.info(f"Analyzing document: {file.filename}")
         
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Load and analyze file
-        df, raw_text = load_file(temp_path)
-        
-        result = {
-            "filename": file.filename,
-            "analysis_type": analysis_type,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        if df is not None:
-            # Structured data analysis
-            result["data_preview"] = df.head().to_dict()
-            result["summary"] = summarize_report(df)
-            result["data_type"] = "structured"
+        # Save uploaded file temporarily; a fresh temp file per request, never a client-chosen path
+        temp_path = _new_temp_path(file.filename)
+        try:
+            _, content_hash = await asyncio.to_thread(_save_upload, file, temp_path)
             
-        elif raw_text:
-            # PDF/text analysis
-            result["text_preview"] = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
-            result["summary"] = summarize_report(raw_text)
-            result["data_type"] = "unstructured"
-        
-        # Clean up temp file
-        os.remove(temp_path)
+            # Load and analyze file; pandas and the LLM client block, so keep them off the event loop
+            result = await run_document_job(_analyze_document_file, temp_path, content_hash, file.filename, analysis_type)
+        finally:
+            _remove_temp_file(temp_path)
         
         return {
             "status": "success",
             "result": result
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Document analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Document analysis failed: {str(e)}")
@@ -331,26 +583,16 @@ async def ask_document_question(file: UploadFile = File(...), question: str = ""
     """Ask questions about uploaded documents"""
     if not SMART_ANALYZER_AVAILABLE:
         raise HTTPException(status_code=503, detail="Smart Analyzer not available")
-    
     try:
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Load file and ask question
-        df, raw_text = load_file(temp_path)
-        
-        if df is not None:
-            answer = ask_question(df, question)
-        elif raw_text:
-            answer = ask_question(raw_text, question)
-        else:
-            answer = "Could not process the uploaded file."
-        
-        # Clean up temp file
-        os.remove(temp_path)
+        # Save uploaded file temporarily; a fresh temp file per request, never a client-chosen path
+        temp_path = _new_temp_path(file.filename)
+        try:
+            _, content_hash = await asyncio.to_thread(_save_upload, file, temp_path)
+            
+            # Load file and ask question
+            answer = await run_document_job(_answer_document_question, temp_path, content_hash, question)
+        finally:
+            _remove_temp_file(temp_path)
         
         return {
             "status": "success",
@@ -359,6 +601,8 @@ async def ask_document_question(file: UploadFile = File(...), question: str = ""
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Question answering failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Question answering failed: {str(e)}")
@@ -377,24 +621,26 @@ async def upload_file(file: UploadFile = File(...)):
         upload_dir = "uploads"
         os.makedirs(upload_dir, exist_ok=True)
         
-        # Generate unique filename
+        # Generate unique filename; only the client's base name is kept, so a
+        # crafted name like "../../x.pdf" cannot write outside upload_dir
         timestamp = int(time.time() * 1000)
-        safe_filename = f"{timestamp}_{file.filename}"
+        safe_filename = f"{timestamp}_{os.path.basename(file.filename)}"
         file_path = os.path.join(upload_dir, safe_filename)
         
         # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Get file size
-        file_size = len(content)
+        file_size, content_hash = await asyncio.to_thread(_save_upload, file, file_path)
         
         logger.info(f"File saved: {file_path} ({file_size} bytes)")
         
-        # Extract text content from PDF
-        logger.info("Starting PDF text extraction...")
-        pdf_content = pdf_processor.extract_text_from_pdf(file_path)
+        # Extract text content from PDF, unless this exact deck was extracted before
+        pdf_content = await pdf_content_cache.get(content_hash)
+        if pdf_content is None:
+            logger.info("Starting PDF text extraction...")
+            pdf_content = await run_ml(pdf_processor.extract_text_from_pdf, file_path)
+            if pdf_content.get('success'):
+                await pdf_content_cache.set(content_hash, pdf_content)
+        else:
+            logger.info("Reusing text extracted from an identical upload")
         
         if pdf_content.get('success'):
             logger.info(f"PDF text extraction successful: {pdf_content['char_count']} characters, {pdf_content['page_count']} pages")
@@ -449,6 +695,8 @@ async def upload_file(file: UploadFile = File(...)):
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
             }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"File upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
@@ -459,7 +707,7 @@ async def get_pdf_content(filename: str):
     try:
         # Look for the extracted content file
         upload_dir = "uploads"
-        extracted_file = os.path.join(upload_dir, f"{filename}.extracted.json")
+        extracted_file = os.path.join(upload_dir, f"{os.path.basename(filename)}.extracted.json")
         
         if not os.path.exists(extracted_file):
             raise HTTPException(status_code=404, detail="Extracted PDF content not found")
@@ -479,20 +727,26 @@ async def get_pdf_content(filename: str):
         raise HTTPException(status_code=500, detail=f"Failed to get PDF content: {str(e)}")
 
 @app.get("/api/analysis-progress/{startup_id}")
-async def get_analysis_progress(startup_id: str):
+async def get_analysis_progress(startup_id: str, request: Request):
     """Get analysis progress with results"""
-    if startup_id in analysis_results:
+    stored_data = await analysis_results.get(startup_id)
+    if stored_data is not None:
+        # Completed results are immutable; a client holding the current copy gets an empty 304
+        etag = stored_data.get("etag")
+        headers = {"ETag": etag, "Cache-Control": COMPLETED_RESULT_CACHE_CONTROL} if etag else None
+        if etag and etag in request.headers.get("if-none-match", "").split(", "):
+            return Response(status_code=304, headers=headers)
+        
         # Return completed analysis with results
-        stored_data = analysis_results[startup_id]
-        return {
+        return ORJSONResponse({
             "progress": 100,
             "current_agent": "completed",
             "status": "completed",
             "agents_completed": ["data_collection", "business_analysis", "risk_assessment", "investment_insights", "report_generation"],
             "results": stored_data["results"],
-            "updated_at": int(time.time() * 1000),
+            "updated_at": stored_data.get("updated_at", int(time.time() * 1000)),
             "timestamp": stored_data["timestamp"]
-        }
+        }, headers=headers)
     else:
         # Return in-progress status
         return {
@@ -508,16 +762,23 @@ async def get_analysis_progress(startup_id: str):
 async def predict_startup_success_ml(startup_data: dict):
     """Predict startup success using ML model"""
     try:
-        result = predict_startup_success(startup_data)
-        return {
-            "status": "success",
-            "prediction": {
+        cache_key = prediction_cache_key(startup_data)
+        prediction = await prediction_cache.get(cache_key)
+        if prediction is None:
+            # The first prediction trains the models; either way it is CPU-bound
+            result = await run_ml(predict_startup_success, startup_data)
+            prediction = {
                 "success_probability": result.success_probability,
                 "prediction": result.prediction,
                 "confidence": result.confidence,
                 "key_factors": result.key_factors,
                 "model_accuracy": result.model_accuracy
-            },
+            }
+            await prediction_cache.set(cache_key, prediction)
+        
+        return {
+            "status": "success",
+            "prediction": prediction,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         }
     except Exception as e:
@@ -534,4 +795,25 @@ except Exception as e:
 if __name__ == "__main__":
     import uvicorn
     logger.info("🚀 Starting Enhanced Startup Analyst Platform...")
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    if os.getenv("DEV"):
+        uvicorn.run("working_backend:app", host="0.0.0.0", port=8080, reload=True)
+    else:
+        # Stored results are only visible across workers when they live in Redis
+        default_workers = os.cpu_count() if analysis_results.shared else 1
+        # Exported so each worker sizes its PDF page pool to its share of the cores
+        os.environ.setdefault("WEB_CONCURRENCY", str(default_workers))
+        # Train and save the predictor once, before the workers start, so each
+        # of them only loads it
+        startup_predictor.ensure_trained()
+        workers = int(os.environ["WEB_CONCURRENCY"])
+        uvicorn.run(
+            # One worker serves this already-built app; an import string there
+            # would import the module a second time and build everything twice
+            "working_backend:app" if workers > 1 else app,
+            host="0.0.0.0",
+            port=8080,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            backlog=2048
+        )